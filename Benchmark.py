@@ -0,0 +1,576 @@
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import words.twl as words
+
+# the starting tile pool, used to draw realistic hands
+tilePool = {"A": 13, "B": 3, "C": 3, "D": 6, "E": 18, "F": 3, "G": 4, "H": 3, "I": 12, "J": 2, "K": 2,
+            "L": 5, "M": 3, "N": 8, "O": 11, "P": 3, "Q": 2, "R": 9, "S": 6, "T": 9, "U": 6, "V": 3,
+            "W": 3, "X": 2, "Y": 3, "Z": 2}
+
+
+# draw random hands from the starting tile pool
+# params: number of hands, tiles per hand, random generator
+def drawHands(count, size, rng):
+    bag = "".join(letter * n for letter, n in tilePool.items())
+    return ["".join(rng.sample(bag, size)) for _ in range(count)]
+
+
+# run a function over a list of inputs and return the mean time per call in microseconds
+# params: function to time, inputs to call it with, OPT number of repeats (best is kept)
+def timePerCall(fn, inputs, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(inputs) * 1e6
+
+
+# print one result line
+def report(name, value, unit="us/call"):
+    print("%-40s %12.2f %s" % (name, value, unit))
+
+
+# word lookups and anagram enumeration on the module API
+def twlBenchmark(seed):
+    rng = random.Random(seed)
+    allWords = list(words.iterator())
+    valid = rng.sample(allWords, 2000)
+    invalid = [w[::-1] + "q" for w in valid]
+    words.cache_clear()
+    report("twl.check (valid, cold cache)", timePerCall(words.check, valid, repeat=1))
+    report("twl.check (invalid, cold cache)", timePerCall(words.check, invalid, repeat=1))
+    report("twl.check (warm cache)", timePerCall(words.check, valid + invalid))
+    batches = [valid[i:i + 20] + invalid[i:i + 20] for i in range(0, 2000, 20)]
+    words.cache_clear()
+    report("twl.check_many (40 words, cold cache)", timePerCall(words.check_many, batches, repeat=1))
+    report("twl.check_many (40 words, warm cache)", timePerCall(words.check_many, batches))
+    words.cache_clear()
+    report("twl.check x 40 (cold cache)", timePerCall(lambda b: [words.check(w) for w in b], batches, repeat=1))
+    for size in (7, 14, 21):
+        hands = drawHands(20 if size < 21 else 5, size, rng)
+        report("twl.anagram (%s tiles)" % size, timePerCall(lambda h: list(words.anagram(h)), hands, repeat=1))
+    start = time.perf_counter()
+    words.word_array()
+    report("build word array", (time.perf_counter() - start) * 1e3, "ms")
+    start = time.perf_counter()
+    words.letter_counts()
+    report("build letter count matrix", (time.perf_counter() - start) * 1e3, "ms")
+    for size in (7, 14, 21, 28, 35):
+        hands = drawHands(10, size, rng)
+        report("twl.formable (%s tiles)" % size, timePerCall(words.formable, hands))
+    for size in (7, 14, 21):
+        hands = drawHands(10, size, rng)
+        report("twl.ranked_anagram best (%s tiles)" % size,
+               timePerCall(lambda h: next(words.ranked_anagram(h, {}, 1), None), hands))
+    dawg = words._dawg()
+    dawg._export = None
+    start = time.perf_counter()
+    count = sum(1 for _ in words.iterator())
+    report("twl.iterator, cold (%s words)" % count, (time.perf_counter() - start) * 1e3, "ms")
+    start = time.perf_counter()
+    sum(1 for _ in words.iterator())
+    report("twl.iterator, warm", (time.perf_counter() - start) * 1e3, "ms")
+
+
+# time a fresh interpreter running a statement, best of a few runs, in milliseconds
+# params: statement to run, extra environment variables, OPT function to call before each run
+def timeInterpreter(statement, env, setup=None, repeat=5):
+    env = dict(os.environ, **env)
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], env=env, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+# interpreter startup plus dictionary import and load: no cache, cold cache (file rebuilt), warm cache (file mapped)
+def startupBenchmark(seed):
+    path = os.path.join(tempfile.mkdtemp(), "twl06.dawg")
+
+    def removeCache():
+        if os.path.exists(path):
+            os.remove(path)
+
+    statement = "import words.twl; words.twl.preload()"
+    report("python -c pass", timeInterpreter("pass", {}), "ms")
+    report("import words.twl", timeInterpreter("import words.twl", {}), "ms")
+    report("preload (cache off)", timeInterpreter(statement, {"TWL_CACHE": ""}), "ms")
+    report("preload (cold cache)", timeInterpreter(statement, {"TWL_CACHE": path}, removeCache), "ms")
+    report("preload (warm cache)", timeInterpreter(statement, {"TWL_CACHE": path}), "ms")
+    removeCache()
+
+
+# approximate memory of a container and everything it holds, counting shared objects once
+# params: object to measure
+def deepSize(obj):
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+# bytes held by the DAWG tables themselves
+def dawgSize(dawg):
+    return sum(memoryview(getattr(dawg, name)).nbytes for name, _ in words._TABLES)
+
+
+# build cost, memory and query latency of the signature anagram index
+def signatureBenchmark(seed):
+    rng = random.Random(seed)
+    dawg = words._dawg()
+    start = time.perf_counter()
+    index = dawg.signatures()
+    report("build signature index", (time.perf_counter() - start) * 1e3, "ms")
+    start = time.perf_counter()
+    prefixes = dawg.signature_prefixes()
+    report("build signature prefixes", (time.perf_counter() - start) * 1e3, "ms")
+    report("DAWG tables", dawgSize(dawg) / 2 ** 20, "MiB")
+    report("signature index (%s keys)" % len(index), deepSize(index) / 2 ** 20, "MiB")
+    report("signature prefixes (%s keys)" % len(prefixes), deepSize(prefixes) / 2 ** 20, "MiB")
+    hands = drawHands(200, 7, rng)
+    report("twl.exact_anagram (7 tiles)", timePerCall(words.exact_anagram, hands))
+    report("filtered twl.anagram (7 tiles)",
+           timePerCall(lambda h: [w for w in words.anagram(h) if len(w) == len(h)], hands))
+    for size in (7, 14, 21):
+        hands = drawHands(20, size, rng)
+        report("twl.anagram (%s tiles)" % size, timePerCall(lambda h: list(words.anagram(h)), hands, repeat=1))
+        report("twl.subset_anagram (%s tiles)" % size,
+               timePerCall(lambda h: list(words.subset_anagram(h)), hands, repeat=1))
+
+
+# play a seeded single-player game with the longest word each turn and snapshot it along the way
+# params: random generator, board sizes (tile counts) to snapshot at
+def playGame(rng, sizes):
+    from game.Util import BananagramsUtil as util
+    bag = list("".join(letter * n for letter, n in tilePool.items()))
+    rng.shuffle(bag)
+    board = {}
+    hand = dict.fromkeys(tilePool, 0)
+    for letter in bag[:21]:
+        hand[letter] += 1
+    del bag[:21]
+    snapshots = []
+    sizes = sorted(sizes)
+    while sizes and bag:
+        if len(board) >= sizes[0]:
+            snapshots.append((board, hand))
+            sizes.pop(0)
+            continue
+        allMoves = util.getAllMoves(board, hand)
+        moves = [(tile, play) for tile in allMoves for play in allMoves[tile]]
+        if util.countTiles(hand) == 0 or not moves:  # peel when out of tiles or stuck
+            hand[bag.pop()] += 1
+            continue
+        move = max(moves, key=lambda m: len(m[1][0]))
+        board, hand = util.makeMove(move, board, hand)
+    return snapshots
+
+
+# a seeded corpus of boards and hands to generate moves from
+# params: seed, number of games to play, board sizes to snapshot each game at
+def boardCorpus(seed, games=3, sizes=(0, 20, 40, 60)):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(games):
+        corpus += playGame(rng, list(sizes))
+    return corpus
+
+
+# add random tiles to a hand until it holds a given number of tiles
+# params: hand, tile count, random generator
+def topUp(hand, size, rng):
+    hand = hand.copy()
+    bag = "".join(letter * n for letter, n in tilePool.items())
+    while sum(hand.values()) < size:
+        hand[rng.choice(bag)] += 1
+    return hand
+
+
+# time a move generator on the board corpus, with the hands as played and topped up to 12 tiles
+# params: move generator taking (board, hand), its name, board corpus, random generator
+def timeMoves(generator, name, corpus, rng):
+    for handSize in (0, 12):
+        for low, high in ((0, 1), (1, 40), (40, 60), (60, 145)):
+            states = [(board, topUp(hand, handSize, rng)) for board, hand in corpus if low <= len(board) < high]
+            if states:
+                label = "%s (%s-%s tiles, %s hand)" % (name, low, high - 1, "12-tile" if handSize else "played")
+                report(label, timePerCall(lambda s: generator(*s), states, repeat=1) / 1e3, "ms/call")
+
+
+# time move generation on the board corpus
+def movesBenchmark(seed):
+    from game.Util import BananagramsUtil as util
+    rng = random.Random(seed)
+    corpus = boardCorpus(seed, sizes=(0, 20, 40, 60, 80))
+    words.cache_clear()
+    timeMoves(util.getAllMoves, "getAllMoves", corpus, rng)
+    info = words.cache_info()
+    report("word cache hit rate (%s lookups)" % (info.hits + info.misses),
+           100 * info.hits / max(1, info.hits + info.misses), "%")
+
+
+# compare the bridge and anchor move generators on late-game boards
+def anchorBenchmark(seed):
+    from game.Util import BananagramsUtil as util
+    rng = random.Random(seed)
+    corpus = [state for state in boardCorpus(seed, games=4, sizes=(60, 80)) if len(state[0]) >= 60]
+    for name, generator in (("getBridgeMoves", util.getBridgeMoves), ("getAnchorMoves", util.getAnchorMoves)):
+        timeMoves(lambda board, hand: generator(util.handToString(hand), board), name,
+                  corpus, random.Random(seed))
+
+
+# time anagram lookups through the anagram cache: misses, memory hits, and hits from its sqlite store in a
+# later run, on hands drawn with repeats as they come up over many games
+def anagramsBenchmark(seed):
+    from game.Util import BananagramsUtil as util
+    rng = random.Random(seed)
+    words.word_list()
+    words.letter_counts()
+    for size in (7, 14, 21):
+        distinct = drawHands(50, size, rng)
+        hands = [rng.choice(distinct) for _ in range(200)]
+        with tempfile.TemporaryDirectory() as folder:
+            words.anagram_cache(path=os.path.join(folder, "anagrams.db"))
+            words.cache_clear()
+            report("util.anagram (%s tiles, cold)" % size, timePerCall(util.anagram, distinct, repeat=1))
+            report("util.anagram (%s tiles, repeats)" % size, timePerCall(util.anagram, hands, repeat=1))
+            words.cache_clear()
+            report("util.anagram (%s tiles, from store)" % size, timePerCall(util.anagram, distinct, repeat=1))
+            info = words.anagram_cache_info()
+            report("anagram cache size (%s tiles)" % size, info.currbytes / 2 ** 20, "MB")
+            words.anagram_cache(path="")
+    words.cache_clear()
+
+
+# compare getBridgeMoves with fits from walking the DAWG and from the position index
+def fitsBenchmark(seed):
+    import game.Util
+    from game.Util import BananagramsUtil as util
+    corpus = [state for state in boardCorpus(seed, games=4, sizes=(20, 60)) if len(state[0]) >= 1]
+    report("build position index", timePerCall(lambda _: words._dawg().position_index(), [None], repeat=1) / 1e3,
+           "ms")
+    for indexed, name in ((False, "fit"), (True, "indexed_fit")):
+        game.Util.indexedFits = indexed
+        timeMoves(lambda board, hand: util.getBridgeMoves(util.handToString(hand), board),
+                  "getBridgeMoves, %s" % name, corpus, random.Random(seed))
+    game.Util.indexedFits = False
+
+
+# A* searches calling getAllMoves directly and through a player's MoveGenerator, which keeps the
+# plays of lines that did not change between the boards of a search
+def generatorBenchmark(seed):
+    import game.Util
+    from players.LongestWordPlayer import LongestAStar
+    rng = random.Random(seed)
+    corpus = [state for state in boardCorpus(seed, games=2, sizes=(20, 40, 60)) if state[0]]
+    states = [(board, topUp(hand, 6, rng)) for board, hand in corpus]
+    for label, incremental in (("getAllMoves", False), ("MoveGenerator", True)):
+        game.Util.incrementalMoves = incremental
+        player = LongestAStar()
+
+        def search(state):
+            player.board, player.hand = state
+            player.nextMoves(*state)
+        report("LongestAStar.nextMoves, %s" % label, timePerCall(search, states, repeat=1) / 1e3, "ms/call")
+    game.Util.incrementalMoves = False
+    report("LongestAStar line plays reused", 100 * player.moveGenerator.hits /
+           max(1, player.moveGenerator.hits + player.moveGenerator.misses), "%")
+
+
+# building line templates with cross checks walked from the board against looking them up in a MoveGenerator's
+# table, and how many corpus boards the bridge, anchor and MoveGenerator moves agree on
+def crossChecksBenchmark(seed):
+    import game.Util
+    from game.Util import BananagramsUtil as util
+    from game.MoveGenerator import MoveGenerator
+    rng = random.Random(seed)
+    corpus = [(board, topUp(hand, 12, rng)) for board, hand in boardCorpus(seed, games=2, sizes=(20, 40, 60))]
+    game.Util.incrementalMoves = True
+    generator = MoveGenerator()
+    lines = []
+    matching = 0
+    for board, hand in corpus:
+        handString = util.handToString(hand)
+        bridgeMoves = util.getBridgeMoves(handString, board)
+        anchorMoves = util.getAnchorMoves(handString, board)
+        generatorMoves = generator.getAllMoves(board, hand)
+        matching += ({tile: sorted(plays) for tile, plays in bridgeMoves.items()} ==
+                     {tile: sorted(plays) for tile, plays in anchorMoves.items()} and anchorMoves == generatorMoves)
+        squareChecks = dict(generator.squareChecks)
+        cols, rows = util.getLineAreas(board)
+        lines += [(board, (col, top), top - bottom + 1, (0, -1), squareChecks) for col, (top, bottom) in cols.items()]
+        lines += [(board, (left, row), left - right + 1, (-1, 0), squareChecks) for row, (left, right) in rows.items()]
+    game.Util.incrementalMoves = False
+    report("boards with matching moves (of %s)" % len(corpus), matching, "")
+    report("getLineCells, walking the board", timePerCall(lambda line: util.getLineCells(*line[:4], 12), lines))
+    report("getLineCells, kept cross checks", timePerCall(lambda line: util.getLineCells(*line[:4], 12, line[4]), lines))
+
+
+# connectivity checks on the board corpus: islandCheck over whole boards, and checkMove on the bridge plays of
+# each board searching the board after the play against trying the play on the board's Islands
+def islandsBenchmark(seed):
+    from game.Util import BananagramsUtil as util
+    from game.Islands import Islands
+    rng = random.Random(seed)
+    corpus = [state for state in boardCorpus(seed, games=2, sizes=(20, 40, 60, 80)) if state[0]]
+    report("islandCheck", timePerCall(lambda state: util.islandCheck(state[0]), corpus))
+    plays = []
+    for board, hand in corpus:
+        islands = Islands(board)
+        allMoves = util.getBridgeMoves(util.handToString(topUp(hand, 12, rng)), board)
+        plays += [((tile, play), util.makeMove((tile, play), board)[0], islands)
+                  for tile in allMoves for play in allMoves[tile]]
+    report("checkMove (%s plays), searching" % len(plays), timePerCall(lambda p: util.checkMove(*p[:2]), plays))
+    report("checkMove (%s plays), on Islands" % len(plays), timePerCall(lambda p: util.checkMove(*p), plays))
+
+
+# dict boards against GridBoards on the board corpus, for the vectorized word starts and anchors and for the
+# util functions that still probe tiles one at a time
+def gridBenchmark(seed):
+    from game.Util import BananagramsUtil as util
+    from game.GridBoard import GridBoard
+    rng = random.Random(seed)
+    corpus = [(board, topUp(hand, 12, rng)) for board, hand in boardCorpus(seed, games=2, sizes=(20, 40, 60, 80))]
+    grids = [(GridBoard(board), hand) for board, hand in corpus]
+    for name, states in (("dict", corpus), ("GridBoard", grids)):
+        report("getFirstTiles, %s" % name, timePerCall(lambda state: util.getFirstTiles(state[0]), states))
+        report("check, %s" % name, timePerCall(lambda state: util.check(state[0]), states))
+        report("getAllMoves, %s" % name, timePerCall(lambda state: util.getAllMoves(*state), states, repeat=1))
+    report("anchors, dict", timePerCall(lambda state: {(x + dx, y + dy) for x, y in state[0]
+                                                       for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                                                       if (x + dx, y + dy) not in state[0]}, corpus))
+    report("anchors, GridBoard", timePerCall(lambda state: state[0].getAnchors(), grids))
+
+
+# memory and copy latency of dict boards against compact Boards with 144 tiles, in a 12 x 12 block and spread out
+# as a played game would, and makeMove and getLineAreas on them
+def boardBenchmark(seed):
+    import tracemalloc
+    from game.Util import BananagramsUtil as util
+    from game.Board import Board
+    rng = random.Random(seed)
+    letters = "".join(letter * n for letter, n in tilePool.items())
+    block = {(x, y): rng.choice(letters) for x in range(-6, 6) for y in range(-6, 6)}
+    spread = {}
+    tile = (0, 0)
+    while len(spread) < 144:  # a random walk that leaves gaps between its tiles
+        spread[tile] = rng.choice(letters)
+        step = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+        tile = (tile[0] + step[0] * rng.choice((1, 2)), tile[1] + step[1] * rng.choice((1, 2)))
+    for shape, tiles in (("block", block), ("spread", spread)):
+        for name, makeBoard in (("dict", lambda: {(x, y): letter for (x, y), letter in tiles.items()}),
+                                ("Board", lambda: Board(tiles))):
+            label = "%s, %s" % (shape, name)
+            tracemalloc.start()
+            board = makeBoard()
+            built = tracemalloc.get_traced_memory()[0]
+            copies = [board.copy() for _ in range(100)]
+            copied = (tracemalloc.get_traced_memory()[0] - built) / len(copies)
+            tracemalloc.stop()
+            report("built board bytes, %s" % label, built, "B")
+            report("copied board bytes, %s" % label, copied, "B")
+            report("copy, %s" % label, timePerCall(lambda b: b.copy(), copies))
+            move = ((100, 100), ("ABCDEFG", 0, (-1, 0)))
+            report("makeMove, %s" % label, timePerCall(lambda b: util.makeMove(move, b), copies))
+            report("getLineAreas, %s" % label, timePerCall(util.getLineAreas, copies))
+            del copies, board
+
+
+# cost of the dead letter pre-check against the move generation it can skip, on the board corpus with the
+# hands as played and with hands of hard letters
+def deadHandsBenchmark(seed):
+    from collections import Counter
+    from game.Util import BananagramsUtil as util
+    rng = random.Random(seed)
+    corpus = boardCorpus(seed, sizes=(0, 20, 40, 60))
+    hardHands = [Counter(rng.choice(["Q", "QQ", "QV", "VV", "QJ", "JX", "QVV", "JQX"])) for _ in corpus]
+    for label, states in (("played hand", corpus), ("hard letters", list(zip([b for b, _ in corpus], hardHands)))):
+        someDead = [state for state in states if util.getDeadLetters(*state)]
+        dead = [state for state in states if util.isDeadHand(state[1], util.getDeadLetters(*state))]
+        report("getDeadLetters (%s)" % label,
+               timePerCall(lambda state: util.getDeadLetters(*state), states, repeat=1) / 1e3, "ms/call")
+        report("getAllMoves (%s)" % label, timePerCall(lambda state: util.getAllMoves(*state), states, repeat=1) / 1e3,
+               "ms/call")
+        report("hands with a dead letter (%s)" % label, 100 * len(someDead) / len(states), "%")
+        report("dead hands (%s)" % label, 100 * len(dead) / len(states), "%")
+        if dead:
+            report("getAllMoves on dead hands (%s)" % label,
+                   timePerCall(lambda state: util.getAllMoves(*state), dead, repeat=1) / 1e3, "ms/call")
+
+
+# a seeded word list of about `size` words: TWL06 plus made-up words one letter off real ones
+# params: seed, number of words
+def syntheticLexicon(seed, size):
+    rng = random.Random(seed)
+    allWords = list(words.iterator())
+    lexicon = set(allWords)
+    while len(lexicon) < size:
+        word = rng.choice(allWords)
+        position = rng.randrange(len(word) + 1)
+        lexicon.add(word[:position] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[position:])
+    return sorted(lexicon)
+
+
+# compile time, peak memory and size of packed lexicons, and load time of the compiled file
+def lexiconBenchmark(seed):
+    import tracemalloc
+    from words import lexicon
+    for name, wordList in (("TWL06", list(words.iterator())), ("synthetic", syntheticLexicon(seed, 280000))):
+        label = "%s (%s words)" % (name, len(wordList))
+        start = time.perf_counter()
+        data = lexicon.compile_words(wordList)
+        report("compile %s" % label, (time.perf_counter() - start) * 1e3, "ms")
+        tracemalloc.start()
+        lexicon.compile_words(wordList)
+        report("compile %s peak memory" % label, tracemalloc.get_traced_memory()[1] / 2 ** 20, "MiB")
+        tracemalloc.stop()
+        report("packed %s, %s records" % (label, len(data) // 4), len(data) / 2 ** 10, "KiB")
+        path = os.path.join(tempfile.mkdtemp(), "lexicon.dawg")
+        lexicon.write(path, data)
+        statement = "import words.twl as t; t.load(%r); t.check('dog')" % path
+        report("load + check %s" % label, timeInterpreter(statement, {}), "ms")
+        os.remove(path)
+
+
+# private and proportional memory of this process in MiB, from /proc (Linux only)
+def processMemory():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return fields["Private_Clean"] + fields["Private_Dirty"], fields["Pss"]
+
+
+# a worker answering big-hand queries, optionally from a shared dictionary, returning its memory use
+# params: shared block name or None, hands to query, barrier shared by all workers
+def dictionaryWorker(name, hands, barrier):
+    if name:
+        words.attach(name)
+    wordList = words.word_list()
+    for hand in hands:
+        [wordList[i] for i in words.formable(hand)]
+        words.check(hand)
+    memory = processMemory()
+    barrier.wait()
+    return memory
+
+
+# per-worker memory with each worker building its own indexes, and attached to one shared copy
+# (one task per worker: each worker waits for the others before it returns)
+def workersBenchmark(seed, workers=8):
+    import multiprocessing
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("needs /proc/self/smaps_rollup")
+        return
+    hands = drawHands(20, 21, random.Random(seed))
+    context = multiprocessing.get_context("spawn")
+    for label, name in (("own indexes", None), ("attached", words.share())):
+        with context.Manager() as manager, context.Pool(workers) as pool:
+            barrier = manager.Barrier(workers)
+            results = pool.starmap(dictionaryWorker, [(name, hands, barrier)] * workers)
+        report("%s, private per worker (%s workers)" % (label, workers),
+               sum(private for private, _ in results) / workers, "MiB")
+        report("%s, proportional per worker" % label, sum(pss for _, pss in results) / workers, "MiB")
+
+
+# load time, memory and query latency of the dictionary under one profile, in a fresh process
+# params: profile name, seed
+def profileWorker(profile, seed):
+    rng = random.Random(seed)
+    results = []
+    start = time.perf_counter()
+    words.profile(profile)
+    words.preload()
+    results.append(("load", (time.perf_counter() - start) * 1e3, "ms"))
+    private, _ = processMemory()
+    results.append(("private memory after load", private, "MiB"))
+    allWords = list(words.iterator())
+    valid = rng.sample(allWords, 2000)
+    invalid = [w[::-1] + "q" for w in valid]
+    words.cache_clear()
+    results.append(("twl.check (valid, cold cache)", timePerCall(words.check, valid, repeat=1), "us/call"))
+    results.append(("twl.check (invalid, cold cache)", timePerCall(words.check, invalid, repeat=1), "us/call"))
+    batches = [valid[i:i + 20] + invalid[i:i + 20] for i in range(0, 2000, 20)]
+    words.cache_clear()
+    results.append(("twl.check_many (40 words, cold cache)", timePerCall(words.check_many, batches, repeat=1),
+                    "us/call"))
+    hands = drawHands(20, 7, rng)
+    results.append(("twl.exact_anagram (7 tiles)", timePerCall(words.exact_anagram, hands, repeat=1), "us/call"))
+    results.append(("twl.anagram (7 tiles)", timePerCall(lambda h: list(words.anagram(h)), hands, repeat=1),
+                    "us/call"))
+    results.append(("twl.cross_check", timePerCall(lambda pair: words.cross_check(*pair),
+                                                    [(w[:1], w[2:3]) for w in valid[:200]], repeat=1), "us/call"))
+    private, _ = processMemory()
+    results.append(("private memory after queries", private, "MiB"))
+    return results
+
+
+# compare the compact and fast dictionary profiles, each in a fresh process
+def profilesBenchmark(seed):
+    import multiprocessing
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("needs /proc/self/smaps_rollup")
+        return
+    context = multiprocessing.get_context("spawn")
+    for profile in words.PROFILES:
+        with context.Pool(1) as pool:
+            results = pool.apply(profileWorker, (profile, seed))
+        for name, value, unit in results:
+            report("%s, %s" % (name, profile), value, unit)
+
+
+benchmarks = {
+    "twl": twlBenchmark,
+    "startup": startupBenchmark,
+    "signature": signatureBenchmark,
+    "moves": movesBenchmark,
+    "anchor": anchorBenchmark,
+    "fits": fitsBenchmark,
+    "anagrams": anagramsBenchmark,
+    "deadhands": deadHandsBenchmark,
+    "generator": generatorBenchmark,
+    "crosschecks": crossChecksBenchmark,
+    "islands": islandsBenchmark,
+    "grid": gridBenchmark,
+    "board": boardBenchmark,
+    "lexicon": lexiconBenchmark,
+    "workers": workersBenchmark,
+    "profiles": profilesBenchmark,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bananagrams AI benchmarks")
+    parser.add_argument("benchmark", nargs="*", help="Benchmarks to run, any of: %s. Default: all."
+                                                     % ", ".join(benchmarks))
+    parser.add_argument("--seed", type=int, default=4100, help="Random seed for generated inputs.")
+    args = parser.parse_args()
+    for name in args.benchmark:
+        if name not in benchmarks:
+            parser.error("unknown benchmark: %s" % name)
+    for name in args.benchmark or benchmarks:
+        print("== %s ==" % name)
+        benchmarks[name](args.seed)
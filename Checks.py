@@ -0,0 +1,306 @@
+import argparse
+import os
+import random
+import string
+import tempfile
+from collections import Counter
+
+import words.twl as words
+from Benchmark import boardCorpus, topUp
+
+
+# checks of the optimized paths against the plain ones they replaced, on seeded inputs; each raises an
+# AssertionError naming the first input they disagree on
+
+
+# a random lowercase string, sometimes with a letter outside a to z
+# params: random generator, OPT longest length
+def randomString(rng, longest=8):
+    letters = string.ascii_lowercase + "é"
+    return "".join(rng.choice(letters) for _ in range(rng.randint(1, longest)))
+
+
+# twl.check and twl.check_many (cached, batched) against membership in the word list
+def wordsCheck(seed):
+    from game.Util import BananagramsUtil as util
+    from words import lexicon
+    rng = random.Random(seed)
+    wordList = words.word_list()
+    wordSet = set(wordList)
+    samples = rng.sample(wordList, 2000) + [randomString(rng) for _ in range(2000)]
+    samples += [word[:-1] + "é" for word in samples[:200]] + [word.upper() for word in samples[:200]]
+    for _ in range(2):  # cold, then from the lookup cache
+        batch = words.check_many(samples)
+        for word, isWord in zip(samples, batch):
+            assert isWord == (word.lower() in wordSet) == words.check(word), word
+    for _ in range(200):  # subset_anagram, signature index or DAWG search, against anagram
+        hand = "".join(rng.choice(string.ascii_lowercase + "?") for _ in range(rng.randint(1, 7)))
+        assert sorted(words.subset_anagram(hand)) == sorted(words.anagram(hand)), hand
+    saved = words._dawg()
+    with tempfile.TemporaryDirectory() as folder:  # a lexicon with one letter words
+        path = os.path.join(folder, "short.dawg")
+        lexicon.write(path, lexicon.compile_words(["a", "at", "i", "it"]))
+        words.load(path)
+        try:
+            assert util.check({(0, 0): "A"}) == ([], ["A"])  # a lone tile is never a word
+            assert util.check({(0, 0): "A", (-1, 0): "T"}) == (["AT"], [])
+        finally:
+            words._DAWG = saved
+            words.cache_clear()
+
+
+# getAnchorMoves against getBridgeMoves, which checks every candidate on a copy of the board, on the board corpus
+# with the hands as played and topped up
+def anchorCheck(seed):
+    from game.Util import BananagramsUtil as util
+    rng = random.Random(seed)
+    for board, hand in boardCorpus(seed, games=2, sizes=(0, 10, 25, 40, 60)):
+        for size in (0, 8, 14):
+            handString = util.handToString(topUp(hand, size, rng))
+            bridgeMoves = util.getBridgeMoves(handString, board)
+            anchorMoves = util.getAnchorMoves(handString, board)
+            assert list(anchorMoves.items()) == list(bridgeMoves.items()), (util.boardToString(board), handString)
+    assert list(words.anchor_fit("d.é", "o")) == []  # cells and letters outside a to z never match
+    assert list(words.anchor_fit("é.", "a")) == []
+    assert list(words.anchor_fit("d..", "oé")) == [(0, "do")]
+
+
+# twl.indexed_fit against twl.fit on random templates, hands and overlap ranges, and twl.match against counting
+# the letters of every word of the pattern's length
+def indexCheck(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        length = rng.randint(2, 16)
+        template = "".join(rng.choice(".....#aestrné") for _ in range(length))
+        letters = "".join(rng.choice("aeiorstnlcdpgh?") for _ in range(rng.randint(1, 12)))
+        overlap = None
+        if rng.random() < 0.5:
+            first = rng.randrange(length)
+            overlap = (first, rng.randrange(first, length))
+        fits = sorted(words.fit(template, letters, overlap))
+        assert sorted(words.indexed_fit(template, letters, overlap)) == fits, (template, letters, overlap)
+    wordList = words.word_list()
+    for _ in range(100):
+        pattern = "".join(rng.choice("...aeé") for _ in range(rng.randint(2, 7)))
+        letters = "".join(rng.choice("aeiorstnlcdpgh?") for _ in range(rng.randint(1, 9)))
+        hand = Counter(letters)
+        expected = []
+        for i, word in enumerate(wordList):
+            if len(word) != len(pattern) or any(cell != "." and cell != letter for cell, letter in zip(pattern, word)):
+                continue
+            need = Counter(letter for cell, letter in zip(pattern, word) if cell == ".")
+            if sum((need - hand).values()) <= hand["?"]:
+                expected.append(i)
+        assert list(words.match(pattern, letters)) == expected, (pattern, letters)
+
+
+# a MoveGenerator against BananagramsUtil.getAllMoves on boards and hands that wander like a search: each call
+# picks a random state seen so far and adds the state after one of its moves, so the generator sees boards that
+# share lines with the last one, differ in several places, and hands that shrink and grow; its kept cross checks
+# are compared with ones built from scratch after every call
+def generatorCheck(seed):
+    import game.Util
+    from game.Util import BananagramsUtil as util
+    from game.MoveGenerator import MoveGenerator
+    rng = random.Random(seed)
+    game.Util.incrementalMoves = True
+    try:
+        generator = MoveGenerator()
+        for board, hand in boardCorpus(seed, games=2, sizes=(0, 10, 25, 40, 60)):
+            states = [(board, topUp(hand, 6, rng))]
+            for _ in range(10):
+                board, hand = rng.choice(states)
+                allMoves = util.getAllMoves(board, hand)
+                assert list(generator.getAllMoves(board, hand).items()) == list(allMoves.items()), \
+                    (util.boardToString(board), util.handToString(hand))
+                squareChecks = {}
+                for x, y in board:
+                    for tile in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                        for branch in ((-1, 0), (0, -1)):
+                            check = None if tile in board else util.getSquareCheck(board, tile, branch)
+                            if check is not None:
+                                squareChecks[(tile, branch)] = check
+                assert generator.squareChecks == squareChecks, util.boardToString(board)
+                moves = [(tile, play) for tile in allMoves for play in allMoves[tile]]
+                if moves and util.countTiles(hand):
+                    board, hand = util.makeMove(rng.choice(moves), board, hand)
+                    states.append((board, topUp(hand, 3, rng)))
+        assert generator.hits and generator.misses  # both kept and searched lines were compared
+    finally:
+        game.Util.incrementalMoves = False
+
+
+# the tiles not connected to the first tile of a board, by the breadth first search islandCheck ran before Islands
+# params: board to search
+def searchStrays(board):
+    if not board:
+        return set()
+    first = next(iter(board))
+    explored = {first}
+    frontier = [first]
+    for x, y in frontier:
+        for tile in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if tile in board and tile not in explored:
+                explored.add(tile)
+                frontier.append(tile)
+    return set(board) - explored
+
+
+# Islands against a breadth first search on random boards: the strays of a starting board, whether the board is one
+# island after placing more tiles, and that undoing the placements gives back the starting state; and checkMove
+# trying moves on a board's Islands against searching the board after each move
+def islandsCheck(seed):
+    from game.Util import BananagramsUtil as util
+    from game.Islands import Islands
+    rng = random.Random(seed)
+    for _ in range(2000):
+        board = {(rng.randint(0, 7), rng.randint(0, 7)): "A" for _ in range(rng.randint(0, 30))}
+        islands = Islands(board)
+        assert set(islands.getStrays()) == searchStrays(board) == set(util.islandCheck(board)), board
+        state = (islands.count, dict(islands.parent), {root: islands.size[root] for root in islands.parent
+                                                          if islands.parent[root] == root})
+        placed = []
+        for _ in range(rng.randint(1, 6)):
+            tile = (rng.randint(-1, 8), rng.randint(-1, 8))
+            if tile not in board:
+                board[tile] = "B"
+                islands.place(tile)
+                placed.append(tile)
+                assert islands.isOneIsland() == (not searchStrays(board)), board
+        islands.undo(len(placed))
+        assert state == (islands.count, islands.parent, {root: islands.size[root] for root in islands.parent
+                                                         if islands.parent[root] == root}), board
+    for board, hand in boardCorpus(seed, games=1, sizes=(10, 30, 50)):  # checkMove on Islands or searching
+        islands = Islands(board)
+        allMoves = util.getAllMoves(board, topUp(hand, 10, rng))
+        moves = [((tile, play), True) for tile in allMoves for play in allMoves[tile]]
+        moves += [(((x + 100, y), play), False) for ((x, y), play), _ in moves[::5]]  # the words apart from the board
+        for move, connected in moves:
+            test, _ = util.makeMove(move, board)
+            assert util.checkMove(move, test, islands) == util.checkMove(move, test) == connected, move
+
+# a board type against dict boards on the board corpus: reading, copying and changing tiles, and the util
+# functions that take boards; moves are compared as sets of plays, boards that iterate in another order than dicts
+# find the same plays in another order
+# params: seed, board type taking a dict board
+def compareBoards(seed, boardType):
+    from game.Util import BananagramsUtil as util
+    rng = random.Random(seed)
+    for board, hand in boardCorpus(seed, games=2, sizes=(0, 5, 20, 40, 60, 80)):
+        typed = boardType(board)
+        assert typed == board and len(typed) == len(board) and set(typed.items()) == set(board.items())
+        assert all(tile in typed for tile in board) and (0.5, 0) not in typed and "AB" not in typed
+        assert util.getFirstTiles(typed) == util.getFirstTiles(board)
+        assert util.getLineAreas(typed) == util.getLineAreas(board)
+        valid, invalid = util.check(board)
+        typedValid, typedInvalid = util.check(typed)
+        assert sorted(typedValid) == sorted(valid) and sorted(typedInvalid) == sorted(invalid)
+        hand = topUp(hand, 8, rng)
+        allMoves = util.getAllMoves(board, hand)
+        typedMoves = util.getAllMoves(typed, hand)
+        assert {tile: sorted(plays) for tile, plays in typedMoves.items()} == \
+               {tile: sorted(plays) for tile, plays in allMoves.items()}, util.boardToString(board)
+        moves = [(tile, play) for tile in allMoves for play in allMoves[tile]]
+        if moves:
+            move = rng.choice(moves)
+            played, _ = util.makeMove(move, typed)
+            assert type(played) is boardType and played == util.makeMove(move, board)[0] and typed == board
+        changed = typed.copy()
+        for tile in list(board)[::2]:
+            del changed[tile]
+        changed[(300, -300)] = "Q"
+        changed[(-300, 300)] = "Z"
+        expected = {tile: letter for tile, letter in list(board.items())[1::2]}
+        expected[(300, -300)] = "Q"
+        expected[(-300, 300)] = "Z"
+        assert changed == expected and len(changed) == len(expected) and typed == board
+        assert util.getLineAreas(changed) == util.getLineAreas(expected)
+
+
+# GridBoard against dict boards, and its vectorized rows, cols and anchors against reading the dict board
+def gridCheck(seed):
+    from game.GridBoard import GridBoard
+    compareBoards(seed, GridBoard)
+    for board, _ in boardCorpus(seed, games=1, sizes=(10, 40, 80)):
+        grid = GridBoard(board)
+        for x, y in board:
+            firstY, cells = grid.getCol(x)
+            assert cells == "".join(board.get((x, firstY - i), words.OPEN) for i in range(len(cells)))
+            firstX, cells = grid.getRow(y)
+            assert cells == "".join(board.get((firstX - i, y), words.OPEN) for i in range(len(cells)))
+        anchors = {(x + dx, y + dy) for x, y in board for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))}
+        assert set(grid.getAnchors()) == anchors - set(board)
+
+
+# Board against dict boards, which it also matches in the order of tiles, lines and moves, and its row and col
+# indexes against reading the dict board
+def boardCheck(seed):
+    from game.Util import BananagramsUtil as util
+    from game.Board import Board
+    compareBoards(seed, Board)
+    rng = random.Random(seed)
+    for board, hand in boardCorpus(seed, games=1, sizes=(10, 40, 80)):
+        compact = Board(board)
+        assert list(compact) == list(board) and list(compact.items()) == list(board.items())
+        assert [list(lines) for lines in util.getLineAreas(compact)] == \
+               [list(lines) for lines in util.getLineAreas(board)]
+        hand = topUp(hand, 8, rng)
+        assert list(util.getAllMoves(compact, hand).items()) == list(util.getAllMoves(board, hand).items())
+        for x, y in board:
+            assert compact.getCol(x) == sorted(tileY for tileX, tileY in board if tileX == x)
+            assert compact.getRow(y) == sorted(tileX for tileX, tileY in board if tileY == y)
+    compact = Board()
+    for tile in ((1 << 15, 0), (0, -(1 << 15)), (1 << 16, 0)):  # would alias to other cells if packed
+        assert tile not in compact and compact.get(tile) is None
+        try:
+            compact[tile] = "A"
+        except ValueError:
+            continue
+        raise AssertionError("Board took out of range tile %r" % (tile,))
+    compact[((1 << 15) - 1, 1 - (1 << 15))] = "A"
+    assert list(compact) == [((1 << 15) - 1, 1 - (1 << 15))]
+
+
+# the first move a one look player ranks from its letter scores against the best of all first moves by its heuristic,
+# for each one look player that ranks first moves
+def firstMovesCheck(seed):
+    from game.Util import BananagramsUtil as util
+    from players.LongestWordPlayer import LongestOneLook
+    from players.ScrabblePlayer import ScrabbleOneLook
+    from players.ShortestWordPlayer import ShortestOneLook
+    rng = random.Random(seed)
+    players = [LongestOneLook(), ScrabbleOneLook(), ShortestOneLook()]
+    for _ in range(300):
+        hand = topUp(Counter(), rng.randint(1, 21), rng)
+        moves = util.getFirstMoves(util.handToString(hand))
+        for player in players:
+            (tile, play), = player.nextMoves({}, hand)
+            if not moves:
+                assert play is None, (str(player), hand)
+                continue
+            best = max(player.heuristic(move) for move in moves)
+            assert tile == (0, 0) and play in moves and player.heuristic(play) == best, (str(player), hand)
+
+
+checks = {
+    "words": wordsCheck,
+    "anchor": anchorCheck,
+    "index": indexCheck,
+    "generator": generatorCheck,
+    "islands": islandsCheck,
+    "grid": gridCheck,
+    "board": boardCheck,
+    "firstmoves": firstMovesCheck,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bananagrams AI equivalence checks")
+    parser.add_argument("check", nargs="*", help="Checks to run, any of: %s. Default: all." % ", ".join(checks))
+    parser.add_argument("--seed", type=int, default=4100, help="Random seed for generated inputs.")
+    args = parser.parse_args()
+    for name in args.check:
+        if name not in checks:
+            parser.error("unknown check: %s" % name)
+    for name in args.check or checks:
+        checks[name](args.seed)
+        print("%-20s ok" % name)
@@ -1,4 +1,6 @@
 import argparse
+import words.twl as words
+from game import Util as gameUtil
 from game.Bananagrams import Bananagrams
 from players.LongestWordPlayer import *
 from players.ScrabblePlayer import *
@@ -58,6 +60,13 @@ custom.add_argument("-sas", "--smart-astar-scrabble", action="count", default=0,
 
 parser.add_argument("-r", "--runs", type=int, default=0, help="Number of runs to simulate. Default: 0 --> "
                                                               "press space to start next game.")
+parser.add_argument("-a", "--anagram-cache", help="Keep anagram results in this sqlite file so later runs start "
+                                                   "warm.")
+parser.add_argument("-am", "--anagram-memory", type=int, help="Memory budget of the anagram cache in MB. Default: 16.")
+parser.add_argument("-g", "--grid-boards", action="store_true", help="Keep player boards in NumPy grids instead of "
+                                                                     "dicts.")
+parser.add_argument("-cb", "--compact-boards", action="store_true", help="Keep player boards in compact Boards "
+                                                                          "instead of dicts.")
 parser.add_argument("-s", "--screen-size", type=int, default=800, help="Resize the game window to SCREEN_SIZE square "
                                                                        "pixels.")
 
@@ -122,6 +131,9 @@ def custom(args):
 
 if __name__ == "__main__":
     args = parser.parse_args()
+    words.anagram_cache(maxbytes=args.anagram_memory and args.anagram_memory << 20, path=args.anagram_cache)
+    gameUtil.gridBoards = args.grid_boards
+    gameUtil.compactBoards = args.compact_boards
     if args.setPlayers == "presets":
         game = presets(args)
     elif args.setPlayers == "custom":
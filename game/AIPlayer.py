@@ -1,4 +1,5 @@
 from abc import abstractmethod, ABC
+from game.MoveGenerator import MoveGenerator
 from game.Player import Player
 from game.Util import BananagramsUtil as util
 
@@ -9,6 +10,10 @@ class AIPlayer(Player, ABC):
         super().__init__()
         self.wordCount = 0
         self.lastWord = None
+        self.deadLetters = []  # letters in hand no word could use, as of the last check
+        self.deadLettersKey = None  # (board size, hand) the dead letters were found for
+        self.moveGenerator = MoveGenerator()  # keeps per col/row work between the boards this player searches, when
+        # incrementalMoves is set
 
     @abstractmethod
     # heuristic for to evaluate a state or a play
@@ -29,14 +34,27 @@ class AIPlayer(Player, ABC):
         else:
             self.dumpLogic()
 
-    # default is dump a random letter
+    # default is dump a random letter, one that no word could use if there are any
     def dumpLogic(self):
-        letter = util.getRandomTile(self.hand)
+        dead = {letter: self.hand[letter] for letter in self.deadLetters if self.hand.get(letter)}
+        letter = util.getRandomTile(dead or self.hand)
         self.dump(letter)
 
+    # find the dead letters of the board and hand, once per turn: the board only changes size and the hand only
+    # changes letters between turns
+    def updateDeadLetters(self):
+        key = (len(self.board), util.handToString(self.hand))
+        if key != self.deadLettersKey:
+            self.deadLetters = util.getDeadLetters(self.board, self.hand)
+            self.deadLettersKey = key
+        return self.deadLetters
+
     # evaluate and make next move
     def play(self, moves=None):
         if moves is None:
+            if util.isDeadHand(self.hand, self.updateDeadLetters()):
+                self.noMoves()  # no word can use any letter in hand, skip move generation and dump
+                return
             moves = self.nextMoves(self.board, self.hand)  # tile to connect to, play to make off that tile
         for move in moves:
             if None in move:
@@ -1,6 +1,7 @@
 import random
 import time
 import pygame as pg
+import words.twl as words
 from players.HumanPlayer import Human
 from game.Util import BananagramsUtil as util
 
@@ -44,6 +45,10 @@ class Bananagrams:
             self.seed = random.randint(0, 100000)
         random.seed(self.seed)  # random seed for consistent play
 
+        # load the dictionary before timing starts, the human game loads it on the first check
+        if not self.onlyHuman:
+            words.preload()
+
         # stats
         self.startTime = time.time()
         self.count = 0
@@ -181,7 +186,7 @@ class Bananagrams:
                     "W": 0, "X": 0, "Y": 0, "Z": 0}
         for p in self.players:  # initialize hands and boards to empty and set player game to this game
             p.hand = emptySet.copy()
-            p.board = {}
+            p.board = util.newBoard()
             p.game = self
         for i in range(self.handSize):  # make random drawings in order
             self.peel()
@@ -207,4 +212,9 @@ class Bananagrams:
         print("--------------------PLAY ENDED--------------------")
         for p in self.stats:
             print(p, "-->", self.stats[p])
+        info = words.anagram_cache_info()
+        lookups = max(1, info.hits + info.stored + info.misses)
+        print("Anagram cache --> %.1f%% hits (%.1f%% from disk) over %s lookups, %.1f of %.1f MB used"
+              % (100 * (info.hits + info.stored) / lookups, 100 * info.stored / lookups,
+                 info.hits + info.stored + info.misses, info.currbytes / 2 ** 20, info.maxbytes / 2 ** 20))
         util.quit(startTime=self.startTime, endTime=endTime)
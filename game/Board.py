@@ -0,0 +1,143 @@
+from collections.abc import ItemsView, MutableMapping
+
+OFFSET = 1 << 15  # added to x and y so both pack into 16 bits, which holds coordinates up to OFFSET - 1 either way
+
+
+# a board that keys its tiles by one packed int instead of an (x, y) tuple, and keeps the used x of each row and y
+# of each col as bitmasks, which are ints as well, so a copy is three flat dict copies with no tuples or sets to
+# rebuild
+# it reads and writes like the (x, y) -> "letter" dict boards, iterating tiles in the order they were placed, so
+# players, drawing code and the util functions can use either
+class Board(MutableMapping):
+    __slots__ = ("cells", "rows", "cols")
+
+    # params: OPT dict board or Board to copy the tiles of
+    def __init__(self, board=None):
+        self.cells = {}  # packed tile -> letter
+        self.rows = {}  # y -> bitmask of the used x in the row, see bit()
+        self.cols = {}  # x -> bitmask of the used y in the col
+        if board:
+            for tile, letter in board.items():
+                self[tile] = letter
+
+    @staticmethod
+    # pack a tile into an int, raising ValueError for a coordinate that does not fit its 16 bits
+    # params: tile
+    def pack(tile):
+        x, y = tile
+        if not (-OFFSET < x < OFFSET and -OFFSET < y < OFFSET):
+            raise ValueError("tile out of range: %r" % (tile,))
+        return (x + OFFSET) << 16 | (y + OFFSET)
+
+    @staticmethod
+    # unpack an int made by pack
+    # params: packed tile
+    def unpack(key):
+        return (key >> 16) - OFFSET, (key & 0xFFFF) - OFFSET
+
+    @staticmethod
+    # get the bit of a coordinate in a row/col mask, interleaving negative and positive coordinates so the masks of
+    # boards around the origin stay small
+    # params: x or y
+    def bit(value):
+        return 1 << (value << 1 if value >= 0 else -(value << 1) - 1)
+
+    @staticmethod
+    # get the coordinates set in a row/col mask, lowest first
+    # params: mask
+    def unmask(mask):
+        values = []
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            values.append(-(index + 1 >> 1) if index & 1 else index >> 1)
+            mask ^= low
+        values.sort()
+        return values
+
+    def __getitem__(self, tile):
+        try:
+            return self.cells[Board.pack(tile)]
+        except (KeyError, TypeError, ValueError):
+            raise KeyError(tile) from None
+
+    def __setitem__(self, tile, letter):
+        key = Board.pack(tile)
+        if key not in self.cells:
+            x, y = tile
+            self.rows[y] = self.rows.get(y, 0) | Board.bit(x)
+            self.cols[x] = self.cols.get(x, 0) | Board.bit(y)
+        self.cells[key] = letter
+
+    def __delitem__(self, tile):
+        try:
+            del self.cells[Board.pack(tile)]
+        except (KeyError, TypeError, ValueError):
+            raise KeyError(tile) from None
+        x, y = tile
+        self.rows[y] &= ~Board.bit(x)
+        if not self.rows[y]:
+            del self.rows[y]
+        self.cols[x] &= ~Board.bit(y)
+        if not self.cols[x]:
+            del self.cols[x]
+
+    def __contains__(self, tile):
+        try:
+            x, y = tile
+            return -OFFSET < x < OFFSET and -OFFSET < y < OFFSET and ((x + OFFSET) << 16 | (y + OFFSET)) in self.cells
+        except (TypeError, ValueError):  # not a tile of ints, so not on the board, as with dict boards
+            return False
+
+    def __iter__(self):
+        return map(Board.unpack, self.cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    # get a view of the (tile, letter) pairs that reads the cells directly instead of looking up each tile
+    def items(self):
+        return BoardItems(self)
+
+    def __repr__(self):
+        return "Board(%r)" % dict(self.items())
+
+    # make a copy of the board that can be changed on its own
+    def copy(self):
+        board = Board.__new__(Board)
+        board.cells = self.cells.copy()
+        board.rows = self.rows.copy()
+        board.cols = self.cols.copy()
+        return board
+
+    # get the used x of a row, lowest first
+    # params: y of the row
+    def getRow(self, y):
+        return Board.unmask(self.rows.get(y, 0))
+
+    # get the used y of a col, lowest first
+    # params: x of the col
+    def getCol(self, x):
+        return Board.unmask(self.cols.get(x, 0))
+
+    # get the highest and lowest used y of each column and the highest and lowest used x of each row, the same as
+    # BananagramsUtil.getLineAreas
+    def getLineAreas(self):
+        cols = {}
+        for x, mask in self.cols.items():
+            ys = Board.unmask(mask)
+            cols[x] = (ys[-1], ys[0])
+        rows = {}
+        for y, mask in self.rows.items():
+            xs = Board.unmask(mask)
+            rows[y] = (xs[-1], xs[0])
+        return cols, rows
+
+
+# the items view of a Board
+class BoardItems(ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        cells = self._mapping.cells
+        return zip(map(Board.unpack, cells), cells.values())
@@ -0,0 +1,177 @@
+from collections.abc import MutableMapping
+
+import numpy as np
+import words.twl as words
+
+
+# a board kept as a 2-D grid of letter codes (0 for an empty tile) instead of a dict of tiles, so rows, cols, anchors
+# and word starts come from whole-grid numpy operations rather than probing tiles one at a time
+# it reads and writes like the (x, y) -> "letter" dict boards, so players and drawing code can use either; tiles are
+# iterated in grid order, not the order they were placed
+class GridBoard(MutableMapping):
+    # params: OPT dict board or GridBoard to copy the tiles of
+    def __init__(self, board=None):
+        self.grid = np.zeros((8, 8), np.uint8)  # grid[y - originY, x - originX] is the letter code at (x, y)
+        self.originX = -4  # x of grid column 0
+        self.originY = -4  # y of grid row 0
+        self.tiles = 0  # number of used tiles
+        if board:
+            for tile, letter in board.items():
+                self[tile] = letter
+
+    # get the grid index of a tile, or None if it is outside the grid
+    # params: tile
+    def index(self, tile):
+        try:
+            x, y = tile
+        except (TypeError, ValueError):
+            return None
+        j = y - self.originY
+        i = x - self.originX
+        height, width = self.grid.shape
+        if 0 <= j < height and 0 <= i < width:
+            return j, i
+        return None
+
+    # double the grid towards a tile until the tile and the tiles next to it are inside it
+    # params: tile to fit
+    def grow(self, tile):
+        x, y = tile
+        height, width = self.grid.shape
+        left, bottom = self.originX, self.originY
+        newWidth, newHeight = width, height
+        while x - 1 < left:
+            left -= newWidth
+            newWidth *= 2
+        while x + 1 >= left + newWidth:
+            newWidth *= 2
+        while y - 1 < bottom:
+            bottom -= newHeight
+            newHeight *= 2
+        while y + 1 >= bottom + newHeight:
+            newHeight *= 2
+        grid = np.zeros((newHeight, newWidth), np.uint8)
+        j = self.originY - bottom
+        i = self.originX - left
+        grid[j:j + height, i:i + width] = self.grid
+        self.grid = grid
+        self.originX = left
+        self.originY = bottom
+
+    def __getitem__(self, tile):
+        try:
+            index = self.index(tile)
+            code = 0 if index is None else self.grid.item(index)
+        except (TypeError, ValueError):
+            code = 0
+        if not code:
+            raise KeyError(tile)
+        return chr(code)
+
+    def __setitem__(self, tile, letter):
+        x, y = tile
+        height, width = self.grid.shape
+        if not (self.originX < x < self.originX + width - 1 and self.originY < y < self.originY + height - 1):
+            self.grow(tile)  # keep an empty border so the masks see every tile's neighbours
+        index = (y - self.originY, x - self.originX)
+        if not self.grid.item(index):
+            self.tiles += 1
+        self.grid[index] = ord(letter)
+
+    def __delitem__(self, tile):
+        if tile not in self:
+            raise KeyError(tile)
+        index = self.index(tile)
+        self.grid[index] = 0
+        self.tiles -= 1
+
+    def __contains__(self, tile):
+        try:
+            x, y = tile
+            height, width = self.grid.shape
+            j = y - self.originY
+            i = x - self.originX
+            return 0 <= j < height and 0 <= i < width and self.grid.item(j, i) != 0
+        except (TypeError, ValueError):  # not a tile of ints, so not on the board, as with dict boards
+            return False
+
+    def __iter__(self):
+        return iter(self.maskTiles(self.grid))
+
+    def __len__(self):
+        return self.tiles
+
+    def __repr__(self):
+        return "GridBoard(%r)" % dict(self.items())
+
+    # make a copy of the board that can be changed on its own
+    def copy(self):
+        board = GridBoard.__new__(GridBoard)
+        board.grid = self.grid.copy()
+        board.originX = self.originX
+        board.originY = self.originY
+        board.tiles = self.tiles
+        return board
+
+    # get a row of the grid as it is read, from high x to low x, with empty tiles as words.OPEN
+    # params: y of the row
+    # returns: x of the first cell, cells
+    def getRow(self, y):
+        j = y - self.originY
+        if not 0 <= j < self.grid.shape[0]:
+            return self.originX, ""
+        cells = self.grid[j, ::-1]
+        return self.originX + len(cells) - 1, GridBoard.toCells(cells)
+
+    # get a col of the grid as it is read, from high y to low y, with empty tiles as words.OPEN
+    # params: x of the col
+    # returns: y of the first cell, cells
+    def getCol(self, x):
+        i = x - self.originX
+        if not 0 <= i < self.grid.shape[1]:
+            return self.originY, ""
+        cells = self.grid[::-1, i]
+        return self.originY + len(cells) - 1, GridBoard.toCells(cells)
+
+    @staticmethod
+    # turn a line of letter codes into a template string
+    # params: 1-D array of letter codes
+    def toCells(cells):
+        return np.where(cells == 0, ord(words.OPEN), cells).astype(np.uint8).tobytes().decode()
+
+    # get masks of the grid cells that have a tile at x + 1, x - 1, y + 1 and y - 1
+    def getNeighbourMasks(self):
+        filled = self.grid != 0
+        high = np.zeros_like(filled)
+        low = np.zeros_like(filled)
+        above = np.zeros_like(filled)
+        below = np.zeros_like(filled)
+        high[:, :-1] = filled[:, 1:]
+        low[:, 1:] = filled[:, :-1]
+        above[:-1, :] = filled[1:, :]
+        below[1:, :] = filled[:-1, :]
+        return high, low, above, below
+
+    # get the tiles a grid mask is set at
+    # params: mask the shape of the grid
+    def maskTiles(self, mask):
+        rows, cols = np.nonzero(mask)
+        return list(zip((cols + self.originX).tolist(), (rows + self.originY).tolist()))
+
+    # get the empty tiles next to a tile, where plays can connect to the board
+    def getAnchors(self):
+        high, low, above, below = self.getNeighbourMasks()
+        return self.maskTiles((high | low | above | below) & (self.grid == 0))
+
+    # get the tiles that are the first letter of each word and the direction, the same as
+    # BananagramsUtil.getFirstTiles
+    def getFirstTiles(self):
+        filled = self.grid != 0
+        high, low, above, below = self.getNeighbourMasks()
+        across = filled & ~high & low
+        down = filled & ~above & below
+        single = filled & ~(high | low | above | below)
+        rows, cols = np.nonzero(across | down | single)
+        directions = zip(across[rows, cols].tolist(), down[rows, cols].tolist())
+        tiles = zip((cols + self.originX).tolist(), (rows + self.originY).tolist())
+        return {tile: (int(isH), int(isV)) for tile, (isH, isV) in zip(tiles, directions)}
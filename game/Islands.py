@@ -0,0 +1,76 @@
+# tracks which tiles of a board are connected with a union-find over the placed tiles, so whether the board is one
+# island is known after each placement without searching the board; placements can be undone, latest first, so a
+# search can try a move and take it back
+class Islands:
+    # params: OPT board to start from
+    def __init__(self, board=None):
+        self.parent = {}  # tile -> tile its island was joined under, the root tile of an island maps to itself
+        self.size = {}  # root tile -> number of tiles in its island
+        self.count = 0  # number of islands
+        self.history = []  # (tile, [(root joined, root it was joined under)]) for each placement, latest last
+        if board:
+            for start in board:  # search each island of the starting board once, joining its tiles under its first
+                if start in self.parent:
+                    continue
+                self.parent[start] = start
+                frontier = [start]
+                for x, y in frontier:
+                    for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                        if neighbour in board and neighbour not in self.parent:
+                            self.parent[neighbour] = start
+                            frontier.append(neighbour)
+                self.size[start] = len(frontier)
+                self.count += 1
+
+    # get the root tile of the island a tile is in
+    # params: placed tile
+    def find(self, tile):
+        parent = self.parent
+        while parent[tile] != tile:  # no path compression, so joins can be undone
+            tile = parent[tile]
+        return tile
+
+    # place a tile and join it with the islands next to it, the smaller island under the larger
+    # params: tile to place
+    def place(self, tile):
+        x, y = tile
+        self.parent[tile] = tile
+        self.size[tile] = 1
+        self.count += 1
+        joins = []
+        for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if neighbour in self.parent:
+                root = self.find(tile)
+                other = self.find(neighbour)
+                if root != other:
+                    if self.size[root] < self.size[other]:
+                        root, other = other, root
+                    self.parent[other] = root
+                    self.size[root] += self.size[other]
+                    self.count -= 1
+                    joins.append((other, root))
+        self.history.append((tile, joins))
+
+    # take back the latest placements
+    # params: OPT number of placements to undo
+    def undo(self, placements=1):
+        for _ in range(placements):
+            tile, joins = self.history.pop()
+            for other, root in reversed(joins):
+                self.parent[other] = other
+                self.size[root] -= self.size[other]
+                self.count += 1
+            del self.parent[tile]
+            del self.size[tile]
+            self.count -= 1
+
+    # return true if all tiles are connected (an empty board is)
+    def isOneIsland(self):
+        return self.count <= 1
+
+    # get the tiles that are not connected to the first tile placed
+    def getStrays(self):
+        if self.count <= 1:
+            return []
+        root = self.find(next(iter(self.parent)))
+        return [tile for tile in self.parent if self.find(tile) != root]
@@ -0,0 +1,108 @@
+from collections import Counter
+from game.Util import BananagramsUtil as util
+import game.Util
+import words.twl as words
+
+
+# generates the same moves as BananagramsUtil.getAllMoves, but keeps the plays found in each col/row between calls:
+# a line is only searched again when a tile changed in or next to it since the last board, or when the hand has
+# letters the kept plays were not searched with (a play found with a hand stays valid for any hand that holds the
+# letters it uses), so the boards of a search, which share most lines and only lose tiles from the hand, mostly
+# filter kept plays instead of searching
+# the letters the crossing words allow at each empty tile next to a word are kept in a table as well, updated at the
+# ends of the runs of tiles that changed, so searching a line does not walk the board for its cross checks
+# it only runs when incrementalMoves is set: diffing each board against the last one costs about what the kept plays
+# save, so it is off by default and calls fall through to BananagramsUtil.getAllMoves
+class MoveGenerator:
+    def __init__(self):
+        self.board = {}  # board of the last call
+        self.squareChecks = {}  # (empty tile, direction of the crossing word) -> letters allowed by cross_check
+        self.lines = {}  # ("col"/"row", x/y) -> (used area, hand counts searched with, [(word, start, letters used)])
+        self.hits = 0  # lines answered from kept plays
+        self.misses = 0  # lines searched
+
+    # get the moves available
+    # params: board to play on, hand to play from
+    def getAllMoves(self, board, hand):
+        if not game.Util.incrementalMoves or not game.Util.anchorMoves:
+            return util.getAllMoves(board, hand)
+        handString = util.handToString(hand)
+        allMoves = {}
+        if handString:
+            self.markDirty(board)
+            cols, rows = util.getLineAreas(board)
+            for col in cols:  # check for words that fit in board vertically
+                top, bottom = cols[col]
+                for word, startIndex in self.getFits(board, ("col", col), cols[col], (col, top), (0, -1), handString):
+                    startTile = (col, top - startIndex)
+                    if startTile not in allMoves:
+                        allMoves[startTile] = []
+                    allMoves[startTile].append((word.upper(), 0, (0, -1)))
+            for row in rows:  # same as cols above
+                left, right = rows[row]
+                for word, startIndex in self.getFits(board, ("row", row), rows[row], (left, row), (-1, 0), handString):
+                    startTile = (left - startIndex, row)
+                    if startTile not in allMoves:
+                        allMoves[startTile] = []
+                    allMoves[startTile].append((word.upper(), 0, (-1, 0)))
+        if not allMoves:
+            allMoves[(0, 0)] = util.getFirstMoves(handString)
+        return allMoves
+
+    # drop the kept plays of every line a tile changed in since the last board, and of every line crossing the
+    # run of tiles through a changed tile, whose cross checks are updated
+    # params: board of this call
+    def markDirty(self, board):
+        changed = set(board.items()) ^ set(self.board.items())
+        for (x, y), _ in changed:
+            self.lines.pop(("col", x), None)
+            self.lines.pop(("row", y), None)
+            for tiles in (board, self.board):
+                left = right = x
+                while (left + 1, y) in tiles:
+                    left += 1
+                while (right - 1, y) in tiles:
+                    right -= 1
+                for col in range(right - 1, left + 2):  # the run and the empty cells at its ends
+                    self.lines.pop(("col", col), None)
+                    self.updateSquareCheck(board, (col, y), (-1, 0))
+                top = bottom = y
+                while (x, top + 1) in tiles:
+                    top += 1
+                while (x, bottom - 1) in tiles:
+                    bottom -= 1
+                for row in range(bottom - 1, top + 2):
+                    self.lines.pop(("row", row), None)
+                    self.updateSquareCheck(board, (x, row), (0, -1))
+        self.board = board.copy()
+
+    # set the cross check of a tile on the board of this call, dropping it if the tile is used or has no word next
+    # to it that way
+    # params: board of this call, tile, direction of the crossing word
+    def updateSquareCheck(self, board, tile, branch):
+        check = None if tile in board else util.getSquareCheck(board, tile, branch)
+        if check is None:
+            self.squareChecks.pop((tile, branch), None)
+        else:
+            self.squareChecks[(tile, branch)] = check
+
+    # get the (word, start index) plays in a col/row, filtered from the kept plays when the line did not change and
+    # they were searched with every letter of the hand, else searched again
+    # params: board, line key, (high, low) used area, first tile of the area, direction of the line, letters in hand
+    def getFits(self, board, key, area, firstTile, direction, handString):
+        handCounts = Counter(handString)
+        line = self.lines.get(key)
+        if line is not None and line[0] == area and all(line[1][letter] >= count for letter, count in handCounts.items()):
+            self.hits += 1
+            return [(word, startIndex) for word, startIndex, used in line[2]
+                    if all(handCounts[letter] >= count for letter, count in used)]
+        self.misses += 1
+        pad = len(handString)
+        length = area[0] - area[1] + 1
+        cells, lineChecks = util.getLineCells(board, firstTile, length, direction, pad, self.squareChecks)
+        fits = []
+        for word, startIndex in util.getLineFits(cells, lineChecks, length, handString):
+            used = Counter(letter for i, letter in enumerate(word.upper()) if cells[startIndex + pad + i] == words.OPEN)
+            fits.append((word, startIndex, tuple(used.items())))
+        self.lines[key] = (area, handCounts, fits)
+        return [(word, startIndex) for word, startIndex, _ in fits]
@@ -1,19 +1,31 @@
-from abc import abstractmethod, ABC
+from abc import ABC
 from game.AIPlayer import AIPlayer
 from game.Util import BananagramsUtil as util
 
 
 # abstract class for a player that only looks one move at a time (max depth = 1)
 class OneLook(AIPlayer, ABC):
-    @abstractmethod
-    # heuristic for to evaluate plays
+    # the heuristic as letter scores plus a score per letter of length, which both heuristic and the first move
+    # ranking read, so first moves are ranked without scoring every anagram; subclasses with a heuristic not of
+    # that form leave letterScores None and override heuristic
+    letterScores = None
+    lengthBonus = 0
+
+    # heuristic for to evaluate plays, the letter scores of the word plus the length bonus per letter
     # params: play to evaluate
     def heuristic(self, play):
-        pass
+        if self.letterScores is None:
+            raise NotImplementedError("%s sets no letterScores, so it must override heuristic" % type(self).__name__)
+        word = play[0]
+        return sum(self.letterScores.get(letter, 0) for letter in word) + self.lengthBonus * len(word)
 
     # nextMove algorithm to choose move
     # params: board to play on, hand to play from
     def nextMoves(self, board, hand):
+        if not board and self.letterScores is not None:
+            handString = util.handToString(hand)
+            bestPlay = next(util.getRankedFirstMoves(handString, self.letterScores, self.lengthBonus), None)
+            return [((0, 0), bestPlay) if bestPlay else (None, None)]
         allPlays = util.getAllMoves(board, hand)
         bestH = float("-inf")
         bestPlay = None
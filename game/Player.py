@@ -11,7 +11,7 @@ class Player(ABC):
         self.screen = 1000  # screen width
         self.scale = 8  # number of tiles across screen
         self.size = int(self.screen / self.scale)  # size of each tile
-        self.board = {}  # dictionary representation of the board -- (x, y): "letter"
+        self.board = util.newBoard()  # dictionary representation of the board -- (x, y): "letter"
         self.hand = {}  # dictionary representation of the player's hand -- "letter": count
         self.center = (0, 0)  # coordinate of tile in center of screen (initial: origin)
         self.dir = (-1, 0)  # direction vector (initial: right)
@@ -21,8 +21,10 @@ class TrialPlayer(AIPlayer, ABC):
         pass
 
     # make a move on a given board and evaluate resulting board
-    # params: board and hand to make sample moves on
-    def sampleMove(self, board, hand):
+    # params: board and hand to make sample moves on, OPT dead letters of the board and hand if already found
+    def sampleMove(self, board, hand, deadLetters=None):
+        if deadLetters is not None and util.isDeadHand(hand, deadLetters):
+            return float("-inf"), [(None, None)]  # no word can use any letter in hand
         sampleMoves = self.nextMoves(board, hand)
         for move in sampleMoves:
             if None in move:  # no plays
@@ -79,13 +81,14 @@ class TrialPlayer(AIPlayer, ABC):
     def testPlay(self):
         sampleHand = self.hand.copy()
         sampleBoard = self.board.copy()
-        score, moves = self.sampleMove(sampleBoard, sampleHand)
+        score, moves = self.sampleMove(sampleBoard, sampleHand, self.updateDeadLetters())
         if util.countTiles(sampleHand) + util.countTiles(self.game.tilePool) == 0:
             return float("inf"), moves
         return score, moves
 
     # evaluates all possible moves by sampling and makes optimal play
     def play(self, moves=None):
+        self.updateDeadLetters()  # for dumpLogic
         if 1 < len(self.game.players) <= util.countTiles(self.game.tilePool):
             peelEval = self.samplePeel()
         else:
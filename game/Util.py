@@ -7,10 +7,18 @@ import os
 import pygame as pg
 import numpy as np
 import words.twl as words
+from game.Islands import Islands
+from game.GridBoard import GridBoard
+from game.Board import Board
 
 nullHand = {"A": 0, "B": 0, "C": 0, "D": 0, "E": 0, "F": 0, "G": 0, "H": 0, "I": 0, "J": 0, "K": 0,
             "L": 0, "M": 0, "N": 0, "O": 0, "P": 0, "Q": 0, "R": 0, "S": 0, "T": 0, "U": 0, "V": 0,
             "W": 0, "X": 0, "Y": 0, "Z": 0}
+anchorMoves = True  # generate moves with getAnchorMoves instead of getBridgeMoves
+indexedFits = False  # find getBridgeMoves fits with the position index instead of walking the DAWG
+gridBoards = False  # give players GridBoards instead of dict boards
+compactBoards = False  # give players Boards instead of dict boards
+incrementalMoves = False  # let A* players keep per col/row plays between the boards they search (MoveGenerator)
 
 
 class BananagramsUtil:
@@ -23,6 +31,15 @@ class BananagramsUtil:
             os.system('afplay /System/Library/Sounds/Glass.aiff')
         sys.exit()
 
+    @staticmethod
+    # make an empty board, a GridBoard if gridBoards is set or a Board if compactBoards is set
+    def newBoard():
+        if gridBoards:
+            return GridBoard()
+        if compactBoards:
+            return Board()
+        return {}
+
     @staticmethod
     # make shallow copy of board
     # params: board to copy
@@ -51,6 +68,30 @@ class BananagramsUtil:
             handString += letter * hand[letter]  # add letters to string
         return handString
 
+    @staticmethod
+    # find all words that can be made from some or all of the letters, in alphabetical order
+    # params: letters to anagram
+    def anagram(letters):
+        wordList = words.word_list()
+        return [wordList[i] for i in words.anagram_ids(letters)]  # cached by the sorted letters
+
+    @staticmethod
+    # find the letters in hand that no word formable from the hand and the letters of one board line can use
+    # params: board to play on, hand to play from
+    def getDeadLetters(board, hand):
+        lines = {}  # letters of each row and column, a word only covers tiles in its own line
+        for (x, y), letter in board.items():
+            lines[("col", x)] = lines.get(("col", x), "") + letter
+            lines[("row", y)] = lines.get(("row", y), "") + letter
+        deadLetters = words.dead_letters(BananagramsUtil.handToString(hand), *lines.values())
+        return [letter.upper() for letter in deadLetters]
+
+    @staticmethod
+    # whether no word can use any letter in hand, so there are no moves at all
+    # params: hand, its dead letters
+    def isDeadHand(hand, deadLetters):
+        return len(deadLetters) > 0 and all(letter in deadLetters for letter in hand if hand[letter])
+
     @staticmethod
     # convert a board tiles into a string display of the board
     def boardToString(board):
@@ -125,6 +166,7 @@ class BananagramsUtil:
             v, i = BananagramsUtil.check(islands)
             invalid += v
         firstTiles = BananagramsUtil.getFirstTiles(board)
+        boardWords = []  # words in the order they are found, checked together at the end
         for tile in firstTiles:  # check each word starting from the found firstTiles
             x, y = firstTiles[tile]
             if x == 1:  # check across word
@@ -133,28 +175,29 @@ class BananagramsUtil:
                 while nextTile in board:  # build word
                     word += board[nextTile]
                     nextTile = (nextTile[0] - 1, nextTile[1])
-                if words.check(word.lower()):
-                    valid.append(word)
-                else:
-                    invalid.append(word)
+                boardWords.append(word)
             if y == 1:  # check down word
                 word = board[tile]
                 nextTile = (tile[0], tile[1] - 1)
                 while nextTile in board:  # build word
                     word += board[nextTile]
                     nextTile = (nextTile[0], nextTile[1] - 1)
-                if words.check(word.lower()):
-                    valid.append(word)
-                else:
-                    invalid.append(word)
+                boardWords.append(word)
             if x == 0 and y == 0:  # if tile has no direction it is a single tile and is not valid
                 invalid.append(board[tile])
+        for word, isWord in zip(boardWords, words.check_many(boardWords)):
+            if isWord:
+                valid.append(word)
+            else:
+                invalid.append(word)
         return valid, invalid
 
     @staticmethod
     # get a dictionary of the tiles that are the first letter of each word and the direction
     # params: board to search
     def getFirstTiles(board):
+        if isinstance(board, GridBoard):
+            return board.getFirstTiles()
         firstTiles = {}
         for tile in board:
             x, y = tile
@@ -175,48 +218,28 @@ class BananagramsUtil:
         return firstTiles
 
     @staticmethod
-    # run bfs to check that all tiles are connected
+    # get the tiles that are not connected to the first tile of the board
+    # params: board to check
     def islandCheck(board):
-        if len(board) == 0:
-            return {}
-        allTiles = list(board)
-        frontier = list()
-        explored = set()
-        start = allTiles[0]
-        frontier.insert(0, start)
-        while len(frontier) > 0:
-            current = frontier.pop()
-            explored.add(current)
-            for successor in BananagramsUtil.getNextSearchTiles(board, current):
-                if successor not in explored and successor not in frontier:
-                    frontier.insert(0, successor)
-        island = set(allTiles) - explored
         islandTiles = {}
-        for tile in island:
+        for tile in Islands(board).getStrays():
             islandTiles[tile] = board[tile]
         return islandTiles
 
-    @staticmethod
-    # get the next tiles in the search
-    # params: board to search, current tile in search
-    def getNextSearchTiles(board, current):
-        successors = []
-        possibleTiles = [(current[0] + 1, current[1]), (current[0] - 1, current[1]),
-                         (current[0], current[1] + 1), (current[0], current[1] - 1)]
-        for t in possibleTiles:
-            if t in board:
-                successors.append(t)
-        return successors
-
     @staticmethod
     # check a board after a given move was made
-    def checkMove(move, board):
+    # params: move made, board after the move, OPT Islands of the board before the move to try the move on
+    def checkMove(move, board, islands=None):
         connect, play = move
         word, offset, direction = play
         nextTile = (connect[0] - (offset * direction[0]), connect[1] - (offset * direction[1]))
+        branchWords = []  # words crossing the move, checked together once they are all built
+        placed = []  # tiles the move placed
         for letter in word:
             if board[nextTile] != letter:
                 return False
+            if islands is not None and nextTile not in islands.parent:
+                placed.append(nextTile)
             branchWord = letter
             branchTile = (nextTile[0] - direction[1], nextTile[1] - direction[0])  # direction is flipped
             while branchTile in board:
@@ -226,10 +249,18 @@ class BananagramsUtil:
             while branchTile in board:
                 branchWord = branchWord + board[branchTile]
                 branchTile = (branchTile[0] + direction[1], branchTile[1] + direction[0])
-            if len(branchWord) > 1 and not words.check(branchWord.lower()):
-                return False
+            if len(branchWord) > 1:
+                branchWords.append(branchWord)
             nextTile = (nextTile[0] + direction[0], nextTile[1] + direction[1])
-        return len(BananagramsUtil.islandCheck(board)) == 0
+        if not all(words.check_many(branchWords)):
+            return False
+        if islands is None:
+            return Islands(board).isOneIsland()
+        for tile in placed:  # try the move on the islands and take it back
+            islands.place(tile)
+        connected = islands.isOneIsland()
+        islands.undo(len(placed))
+        return connected
 
     @staticmethod
     # get the moves available
@@ -237,7 +268,10 @@ class BananagramsUtil:
     def getAllMoves(board, hand):
         handString = BananagramsUtil.handToString(hand)
         allMoves = {}
-        bridgeMoves = BananagramsUtil.getBridgeMoves(handString, board)
+        if anchorMoves:
+            bridgeMoves = BananagramsUtil.getAnchorMoves(handString, board)
+        else:
+            bridgeMoves = BananagramsUtil.getBridgeMoves(handString, board)
         for tile in bridgeMoves:
             if tile in allMoves:
                 allMoves[tile] += bridgeMoves[tile]
@@ -251,14 +285,6 @@ class BananagramsUtil:
     # get plays that bridge between two or more tiles already on the board
     def getBridgeMoves(handString, board):
         # helper methods
-        # get all words in a column/row
-        # params: priority queue with letters in a col/row
-        def getWords(pQueue):
-            tileLetters = ""
-            for item in pQueue.heap:  # add each tile's letter to string
-                tileLetters += board[item[2]]
-            return list(words.anagram(handString + tileLetters))  # find anagrams
-
         # convert priority queue of letters to a list with blanks in gaps between tiles
         # params: priority queue
         def queueToList(pQueue):
@@ -282,93 +308,147 @@ class BananagramsUtil:
                     prev = t
             return order
 
-        # check the order and spacing of letters in a word to make sure they fit in the board
-        # params: word to check, list of [(letter, tile)]
-        def getFit(word, handString, rowColQList):
-            startOffsets = []
-            lenW = len(word)
-            lenQ = len(rowColQList)
-            for startIndex in range(1 - lenW, lenQ):  # check all connected offsets for word in col/row
-                hand = list(handString)
-                fits = True
-                fromHand = False
-                spaceBefore = startIndex <= 0
-                spaceAfter = startIndex + lenW >= lenQ
-                for wordIndex, letter in enumerate(word):  # check each letter in word for current offset
-                    letter = letter.upper()
-                    queueIndex = startIndex + wordIndex
-                    if 0 <= queueIndex < lenQ:  # is letter within used col/row area
-                        queueLetter, _ = rowColQList[queueIndex]
-                        if queueLetter is None:  # if tile is blank
-                            if letter in hand:  # make sure letter is in hand
-                                hand.remove(letter)
-                                fromHand = True
-                            else:  # if letter is not in hand offset doesn't fit
-                                fits = False
-                                break
-                        elif queueLetter != letter:  # if tile is used and not the same as the letter of word
-                            fits = False  # offset doesn't fit
-                            break
-                    elif letter in hand:  # letter is not within board area, make sure it is in te hand
-                        hand.remove(letter)
-                        fromHand = True
-                    else:  # letter is not within board area, and not in hand then offset doesn't fit
-                        fits = False
-                        break
-                if not spaceBefore:
-                    spaceBefore = rowColQList[startIndex - 1][0] is None
-                if not spaceAfter:
-                    spaceAfter = rowColQList[startIndex + lenW][0] is None
-                # if passed checks above the offset fits and should be added to the list
-                if fits and fromHand and spaceBefore and spaceAfter:
-                    startOffsets.append(-startIndex)
-            return startOffsets
+        # find the words that fit in a col/row using letters from the hand, sorted by word then position
+        # params: letters in hand, list of [(letter, tile)]
+        def getFits(handString, rowColQList):
+            pad = len(handString)  # a word can only reach as far past the used area as the hand is long
+            lineLetters = "".join(letter or words.OPEN for letter, _ in rowColQList)
+            template = words.OPEN * pad + lineLetters + words.OPEN * pad
+            overlap = (pad, pad + len(rowColQList) - 1)  # words have to overlap the used area
+            fit = words.indexed_fit if indexedFits else words.fit
+            fits = sorted((word, start - pad) for start, word in fit(template, handString, overlap))
+            return [(word, -startIndex) for word, startIndex in fits]
 
         # main method
         if handString == "":
             return {}
         cols, rows = BananagramsUtil.getColsRows(board)
-        colWords = {}  # holds all the words that are playable vertically
-        rowWords = {}  # holds all the words that are playable horizontally
-        for col in cols:  # get all words from each column and row
-            colWords[col] = getWords(cols[col])
-        for row in rows:
-            rowWords[row] = getWords(rows[row])
+        islands = Islands(board)  # each play is tried on the islands of the board instead of searching its copy
         allMoves = {}  # holds all the plays available with the current hand
-        for col in colWords:  # check for words that fit in board vertically
-            wordList = colWords[col]
+        for col in cols:  # check for words that fit in board vertically
             colList = queueToList(cols[col])
             firstTile = colList[0][1]
-            for word in wordList:  # go through all words in col
-                startOffsets = getFit(word, handString, colList)
-                for offset in startOffsets:  # go through all offsets for word
-                    startTile = (col, firstTile[1] + offset)
-                    play = (word.upper(), 0, (0, -1))
-                    move = (startTile, play)
-                    test, _ = BananagramsUtil.makeMove(move, board)
-                    if BananagramsUtil.checkMove(move, test):  # check copy of board for valid
-                        BananagramsUtil.checkMove(move, test)
-                        if startTile not in allMoves:
-                            allMoves[startTile] = []
-                        allMoves[startTile].append((word.upper(), 0, (0, -1)))
-        for row in rowWords:  # same as cols above
-            wordList = rowWords[row]
+            for word, offset in getFits(handString, colList):  # go through all words and offsets in col
+                startTile = (col, firstTile[1] + offset)
+                play = (word.upper(), 0, (0, -1))
+                move = (startTile, play)
+                test, _ = BananagramsUtil.makeMove(move, board)
+                if BananagramsUtil.checkMove(move, test, islands):  # check copy of board for valid
+                    if startTile not in allMoves:
+                        allMoves[startTile] = []
+                    allMoves[startTile].append((word.upper(), 0, (0, -1)))
+        for row in rows:  # same as cols above
             rowList = queueToList(rows[row])
             firstTile = rowList[0][1]
-            for word in wordList:
-                startOffsets = getFit(word, handString, rowList)
-                for offset in startOffsets:
-                    startTile = (firstTile[0] + offset, row)
-                    play = (word.upper(), 0, (-1, 0))
-                    move = (startTile, play)
-                    test, _ = BananagramsUtil.makeMove(move, board)
-                    if BananagramsUtil.checkMove(move, test):
-                        BananagramsUtil.checkMove(move, test)
-                        if startTile not in allMoves:
-                            allMoves[startTile] = []
-                        allMoves[startTile].append(play)
+            for word, offset in getFits(handString, rowList):
+                startTile = (firstTile[0] + offset, row)
+                play = (word.upper(), 0, (-1, 0))
+                move = (startTile, play)
+                test, _ = BananagramsUtil.makeMove(move, board)
+                if BananagramsUtil.checkMove(move, test, islands):
+                    if startTile not in allMoves:
+                        allMoves[startTile] = []
+                    allMoves[startTile].append(play)
+        return allMoves
+
+    @staticmethod
+    # get the same plays as getBridgeMoves by growing words from anchor squares (empty squares next to a tile),
+    # only placing letters that keep the crossing words valid so no play has to be checked afterwards
+    # the board must be a single valid island, as boards built from generated moves always are
+    # params: letters in hand, board to play on
+    def getAnchorMoves(handString, board):
+        if handString == "":
+            return {}
+        pad = len(handString)  # a word can only reach as far past the used area as the hand is long
+        cols, rows = BananagramsUtil.getLineAreas(board)
+        allMoves = {}  # holds all the plays available with the current hand
+        for col in cols:  # check for words that fit in board vertically
+            top, bottom = cols[col]
+            cells, lineChecks = BananagramsUtil.getLineCells(board, (col, top), top - bottom + 1, (0, -1), pad)
+            for word, startIndex in BananagramsUtil.getLineFits(cells, lineChecks, top - bottom + 1, handString):
+                startTile = (col, top - startIndex)
+                if startTile not in allMoves:
+                    allMoves[startTile] = []
+                allMoves[startTile].append((word.upper(), 0, (0, -1)))
+        for row in rows:  # same as cols above
+            left, right = rows[row]
+            cells, lineChecks = BananagramsUtil.getLineCells(board, (left, row), left - right + 1, (-1, 0), pad)
+            for word, startIndex in BananagramsUtil.getLineFits(cells, lineChecks, left - right + 1, handString):
+                startTile = (left - startIndex, row)
+                if startTile not in allMoves:
+                    allMoves[startTile] = []
+                allMoves[startTile].append((word.upper(), 0, (-1, 0)))
         return allMoves
 
+    @staticmethod
+    # get the highest and lowest used y of each column and the highest and lowest used x of each row
+    # params: board to get from
+    def getLineAreas(board):
+        if isinstance(board, Board):
+            return board.getLineAreas()
+        cols = {}
+        rows = {}
+        for x, y in board:
+            top, bottom = cols.get(x, (y, y))
+            cols[x] = (max(top, y), min(bottom, y))
+            left, right = rows.get(y, (x, x))
+            rows[y] = (max(left, x), min(right, x))
+        return cols, rows
+
+    @staticmethod
+    # get the template of a col/row, padded on both sides, and the letters allowed by the crossing words at each
+    # empty cell next to another word
+    # params: board, first tile of the used col/row area, length of the area, direction of the col/row, padding,
+    #         OPT table of cross checks kept by a MoveGenerator to look up instead of building
+    def getLineCells(board, firstTile, length, direction, pad, squareChecks=None):
+        branch = (direction[1], direction[0])  # direction is flipped
+        cells = []
+        lineChecks = {}
+        for i in range(-pad, length + pad):
+            tile = (firstTile[0] + i * direction[0], firstTile[1] + i * direction[1])
+            if tile in board:
+                cells.append(board[tile])
+                continue
+            cells.append(words.OPEN)
+            if squareChecks is None:
+                check = BananagramsUtil.getSquareCheck(board, tile, branch)
+            else:
+                check = squareChecks.get((tile, branch))
+            if check is not None:  # tile is next to another word
+                lineChecks[len(cells) - 1] = check
+        return "".join(cells), lineChecks
+
+    @staticmethod
+    # get the letters allowed at an empty tile by the word crossing it, or None if no tile is next to it that way
+    # params: board, empty tile, direction of the crossing word
+    def getSquareCheck(board, tile, branch):
+        before = ""
+        branchTile = (tile[0] - branch[0], tile[1] - branch[1])
+        while branchTile in board:
+            before = board[branchTile] + before
+            branchTile = (branchTile[0] - branch[0], branchTile[1] - branch[1])
+        after = ""
+        branchTile = (tile[0] + branch[0], tile[1] + branch[1])
+        while branchTile in board:
+            after = after + board[branchTile]
+            branchTile = (branchTile[0] + branch[0], branchTile[1] + branch[1])
+        if before or after:
+            return words.cross_check(before, after)
+        return None
+
+    @staticmethod
+    # get the (word, start index) plays in a col/row, sorted by word then position
+    # params: line template and cross checks from getLineCells, length of the used area, letters in hand
+    def getLineFits(cells, lineChecks, length, handString):
+        pad = len(handString)
+        fits = []
+        for start, word in words.anchor_fit(cells, handString, lineChecks):
+            startIndex = start - pad
+            if startIndex < length and startIndex + len(word) > 0:  # word overlaps used area
+                fits.append((word, startIndex))
+        fits.sort()
+        return fits
+
     @staticmethod
     # create two dictionaries with all tiles in each occupied column and row of the board
     # params: board to get from
@@ -392,13 +472,20 @@ class BananagramsUtil:
     # get words to play from hand to blank board
     # params: letters in hand
     def getFirstMoves(letters):
-        allWords = list(words.anagram(letters))  # empty board means all anagrams are valid
+        allWords = BananagramsUtil.anagram(letters)  # empty board means all anagrams are valid
         moves = []
         for word in allWords:
             word = word.upper()
             moves.append((word, 0, (-1, 0)))  # all first plays go across
         return moves
 
+    @staticmethod
+    # get first moves best first by a score of letter values plus a bonus per letter, ties alphabetically
+    # params: letters to play, scores of each letter, score per letter of word length
+    def getRankedFirstMoves(letters, letterScores, lengthBonus):
+        for score, word in words.ranked_anagram(letters, letterScores, lengthBonus):
+            yield word.upper(), 0, (-1, 0)  # all first plays go across
+
     @staticmethod
     # get the boundaries of used the board (left, top, right, bottom)
     # params: board to check
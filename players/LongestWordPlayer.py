@@ -7,14 +7,13 @@ from game.Util import BananagramsUtil as util
 
 # one look player that plays the longest word available
 class LongestOneLook(OneLook):
+    letterScores = {}
+    lengthBonus = 1  # heuristic is the length of the word
+
     # what should return when printed
     def __str__(self):
         return "Longest Word One Look"
 
-    # evaluate play/state
-    def heuristic(self, play):
-        return len(play[0])  # return length of word
-
 
 # A* player that plays the longest words available
 class LongestAStar(AStar):
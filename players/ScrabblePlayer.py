@@ -22,13 +22,11 @@ def scrabbleScore(letters):
 
 # one look player that plays the highest scoring scrabble word available
 class ScrabbleOneLook(OneLook):
+    letterScores = scrabble  # heuristic is the scrabble score of the word
+
     def __str__(self):
         return "Scrabble One Look"
 
-    def heuristic(self, play):
-        word = play[0]
-        return scrabbleScore(word)
-
 
 # A* player that uses words with high scrabble scores first
 class ScrabbleAStar(AStar):
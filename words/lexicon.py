@@ -0,0 +1,199 @@
+'''
+Compiles a word list into the packed DAWG format used by twl.
+
+Words are read one per line and built into a minimized DAWG as they
+stream in (Daciuk et al.'s incremental algorithm for sorted input),
+so memory grows with the size of the graph rather than the list.
+The graph is then packed into the same 32-bit record table that twl
+ships for TWL06:
+
+MLLLLLLL IIIIIIII IIIIIIII IIIIIIII
+
+The packed records can be embedded in a module like twl's _DATA
+(see encode()), or written as a binary lexicon file that twl.load()
+maps straight from disk (see write()).
+
+Sample usage:
+
+>>> from words import lexicon, twl
+>>> data = lexicon.compile_words(['cat', 'cats', 'dog', 'dogs'])
+>>> lexicon.write('pets.dawg', data)
+>>> twl.load('pets.dawg')
+>>> list(twl.iterator())
+['cat', 'cats', 'dog', 'dogs']
+
+From the command line:
+
+python -m words.lexicon words.txt words.dawg
+'''
+import argparse
+import base64
+import struct
+import sys
+import time
+import zlib
+
+from words import twl
+
+# the largest record index a 24-bit link can hold
+_MAX_RECORDS = 1 << 24
+
+
+def read_words(path):
+    '''
+    Yields the words of a text file with one word per line, lowercased
+    and stripped. Blank lines are skipped.
+    '''
+    with open(path) as f:
+        for line in f:
+            word = line.strip().lower()
+            if word:
+                yield word
+
+
+def build(words):
+    '''
+    Returns the root _Node of the minimized DAWG of `words`, which
+    must be lowercase 'a' to 'z' strings in strictly increasing order.
+    '''
+    root = _Node()
+    register = {}
+    path = [root]  # path[i] is the node reached after i letters of the previous word
+    previous = ''
+    for word in words:
+        if word <= previous:
+            raise ValueError('words must be sorted and unique: %r after %r' % (word, previous))
+        if not word.isalpha() or not word.isascii() or not word.islower():
+            raise ValueError('words may only use the letters a to z: %r' % word)
+        common = 0
+        limit = min(len(previous), len(word))
+        while common < limit and previous[common] == word[common]:
+            common += 1
+        _minimize(path, common, register)
+        for letter in word[common:]:
+            node = _Node()
+            path[-1].edges.append((letter, node))
+            path.append(node)
+        path[-1].final = True
+        previous = word
+    _minimize(path, 0, register)
+    return root
+
+
+def pack(root):
+    '''
+    Returns the packed 32-bit record table (little-endian bytes) of a
+    DAWG built by build(). Each node becomes a run of records: '$' first
+    if it ends a word, then one record per child in letter order, all
+    but the last with the More flag set. The root's run is at index 0.
+    '''
+    if not root.edges:
+        raise ValueError('no words to pack')
+    offsets = {}
+    order = []
+    stack = [root]
+    count = 0
+    while stack:  # give each node its record offset, in depth first order
+        node = stack.pop()
+        if node.key in offsets:
+            continue
+        offsets[node.key] = count
+        order.append(node)
+        count += node.final + len(node.edges)
+        stack.extend(child for _, child in reversed(node.edges))
+    if count > _MAX_RECORDS:
+        raise ValueError('%d records do not fit 24-bit links' % count)
+    records = []
+    for node in order:
+        run = [(ord(twl.END), 0)] if node.final else []
+        run += [(ord(letter), offsets[child.key]) for letter, child in node.edges]
+        for i, (code, link) in enumerate(run):
+            more = i + 1 < len(run)
+            records.append(more << 31 | code << 24 | link)
+    return struct.pack('<%dI' % len(records), *records)
+
+
+def compile_words(words):
+    '''
+    Returns the packed record table for `words` (see build() and pack()).
+    '''
+    return pack(build(words))
+
+
+def encode(data):
+    '''
+    Returns packed records as a base-64 encoded, zlib-compressed string,
+    the form twl keeps its own data in.
+    '''
+    return base64.b64encode(zlib.compress(data, 9)).decode()
+
+
+def write(path, data):
+    '''
+    Writes packed records to `path` as a binary lexicon file that
+    twl.load() can map.
+    '''
+    twl._write_cache(path, twl._build_tables(data), zlib.crc32(data))
+
+
+class _Node(object):
+    '''
+    A DAWG node under construction: whether a word ends here, its
+    (letter, child) edges in letter order, and once minimized, a key
+    that is equal for equivalent nodes.
+    '''
+    __slots__ = ('final', 'edges', 'key')
+
+    def __init__(self):
+        self.final = False
+        self.edges = []
+        self.key = None
+
+
+def _minimize(path, depth, register):
+    '''
+    Replaces the nodes of `path` below `depth` with their registered
+    equivalents, registering the ones that are new, and trims the path
+    to `depth` + 1 nodes. Nodes are done once no later word can add
+    edges to them, which in sorted input is once a word leaves them.
+    '''
+    while len(path) > depth + 1:
+        node = path.pop()
+        key = (node.final,) + tuple((letter, child.key) for letter, child in node.edges)
+        known = register.get(key)
+        if known is None:
+            node.key = len(register)
+            register[key] = known = node
+        letter, _ = path[-1].edges[-1]
+        path[-1].edges[-1] = (letter, known)
+    if depth == 0 and path[0].key is None:
+        path[0].key = -1  # the root is never shared
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile a word list into a packed DAWG lexicon.')
+    parser.add_argument('words', help='Text file with one word per line.')
+    parser.add_argument('output', help='Lexicon file to write, for twl.load().')
+    parser.add_argument('--sort', action='store_true', help='Sort the words first (reads them all into memory).')
+    parser.add_argument('--module', action='store_true',
+                        help='Write the encoded string for a module\'s _DATA instead of a lexicon file.')
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    words = read_words(args.words)
+    if args.sort:
+        words = sorted(set(words))
+    try:
+        data = compile_words(words)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    if args.module:
+        with open(args.output, 'w') as f:
+            f.write(encode(data))
+    else:
+        write(args.output, data)
+    print('%d records (%d KB) in %.2f s' % (len(data) // 4, len(data) // 1024, elapsed), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
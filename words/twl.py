@@ -6,8 +6,15 @@ Functionality:
 
 - Check if a word is in the dictionary.
 - Enumerate all words in the dictionary.
+- Get all words at once as a NumPy array of fixed-width strings.
 - Determine what letters may appear after a given prefix.
+- Determine what letters appear anywhere after a given prefix.
 - Determine what words can be formed by anagramming a set of letters.
+- Look up the words that use exactly a set of letters.
+- Find the letters that can fill a gap between two parts of a word.
+- Find the words that match a pattern of fixed letters and blanks.
+- Read precomputed metadata (length, score, letters) of any word.
+- Find the letters of a hand that no formable word can use.
 
 Sample usage:
 
@@ -32,11 +39,35 @@ Implemented using a DAWG (Directed Acyclic Word Graph) packed in a
 binary lookup table for a very small memory footprint, not only on 
 disk but also once loaded into RAM. In fact, this is the primary
 benefit of this method over others - it is optimized for low memory
-usage (not speed).
+usage (not speed). That is the default 'compact' profile; the 'fast'
+profile (profile() or TWL_PROFILE) trades tens of MB for speed by
+building every index when the dictionary loads, including a set of all
+words that check() answers from.
 
 The data is stored in the Python module as a base-64 encoded, 
 zlib-compressed string.
 
+Nothing is loaded at import time: the first lookup (or preload())
+loads the dictionary. The first load decodes the data and writes a
+binary cache file (by default __pycache__/twl06.dawg next to this
+module, or in the user's cache or temporary directory when that is
+not writable, see TWL_CACHE). Later loads map that file with mmap and
+read records straight from it, so processes on the same machine share
+one copy through the page cache.
+The file carries a format version and checksums of both its contents
+and the module data, and is rebuilt whenever either does not match.
+
+For pools of worker processes, share() copies the tables, the word
+list and the letter count matrix into one shared memory block and
+returns its name; workers call attach(name) to read all of them in place
+rather than each building private copies.
+
+anagram_ids() caches its results under the sorted letters, so every
+ordering of the same tiles shares an entry, in an LRU cache bounded by
+a memory budget. Pointed at an sqlite file (anagram_cache() or
+TWL_ANAGRAMS), the cache also keeps every result there, keyed by a
+checksum of the lexicon, so later runs start warm.
+
 Each record of the DAWG table is packed into a 32-bit integer.
 
 MLLLLLLL IIIIIIII IIIIIIII IIIIIIII
@@ -48,6 +79,32 @@ I - Index (Pointer)
 The helper method _get_record(index) will extract these three elements 
 into a Python tuple such as (True, 'a', 26). 
 
+When the dictionary is loaded the table is decoded once into three
+parallel arrays - more flags, letter codes and links - so lookups
+index straight into them instead of unpacking each record.
+
+A fourth array holds a child mask per record: the set of letters of
+that record and the siblings after it, with bit 0 for '$' and bits 1
+to 26 for 'a' to 'z'. The mask at a node's first record is the set of
+its children, so testing for an edge is one bit test and the child's
+record is the node's index plus the number of mask bits below the
+letter's bit. Searches intersect it with the letters they can still
+play to skip whole runs of siblings.
+
+Three more arrays annotate each record the same way: the most and
+the fewest letters a word below it can still add, and the letters
+that appear anywhere below it. The anagram search uses the lengths to
+drop branches whose words are all longer than the tiles left or
+outside a requested length window. They are stored in the cache
+file; without one they are only built by the first search that
+prunes with them, so plain lookups never pay for them.
+
+Every word also has a row of metadata, indexed by its word id (its
+position in alphabetical order): length, Scrabble score, letter mask,
+vowel count and rare letter flags. These are built with the tables
+and kept in the same cache file, so word_info() costs nothing after
+the first load.
+
 All searches start at index 0 in the lookup table. Records are scanned 
 sequentially as long as the More flag is set. These records represent all 
 of the children of the current node in the DAWG. For example, the first
@@ -116,12 +173,29 @@ http://en.wikipedia.org/wiki/Official_Tournament_and_Club_Word_List
 http://www.isc.ro/lists/twl06.zip
 '''
 
+import array
+import atexit
 import base64
+import bisect
 import collections
+import collections.abc
+import functools
 import itertools
+import mmap
+import operator
+import os
+import sqlite3
 import struct
+import sys
+import tempfile
+import threading
 import zlib
 
+try:
+    import numpy
+except ImportError:  # only the vectorized queries need it
+    numpy = None
+
 
 def check(word):
     '''
@@ -133,7 +207,86 @@ def check(word):
     >>> twl.check('asdf')
     False
     '''
-    return word.lower() in _DAWG
+    word = word.lower()
+    dawg = _dawg()
+    if dawg.word_set is not None:  # fast profile
+        return word in dawg.word_set
+    found = _CACHE.get(word)
+    if found is None:
+        found = word in dawg
+        _CACHE.put(word, found)
+    return found
+
+
+def check_many(words):
+    '''
+    Returns a list of booleans telling whether each word in `words`
+    exists in the TWL06 dictionary.
+
+    Answers come from the lookup cache where possible. The rest are
+    looked up in one pass over the DAWG in sorted order, so words
+    that share a prefix share its traversal.
+
+    >>> twl.check_many(['word', 'asdf', 'words'])
+    [True, False, True]
+    '''
+    words = [word.lower() for word in words]
+    dawg = _dawg()
+    if dawg.word_set is not None:  # fast profile
+        return [word in dawg.word_set for word in words]
+    results = {}
+    missing = []
+    for word in words:
+        if word not in results:
+            found = _CACHE.get(word)
+            results[word] = found
+            if found is None:
+                missing.append(word)
+    if missing:
+        for word, found in dawg.check_sorted(sorted(missing)):
+            results[word] = found
+            _CACHE.put(word, found)
+    return [results[word] for word in words]
+
+
+def cache_info():
+    '''
+    Returns the hits, misses, maximum size and current size of the
+    word lookup cache used by check() and check_many().
+    '''
+    return _CACHE.info()
+
+
+def cache_clear():
+    '''
+    Empties the word lookup cache and resets its counters, and empties
+    the cross_check() cache and the in-memory part of the anagram
+    cache (see anagram_ids()).
+    '''
+    _CACHE.clear()
+    _CROSS_CHECKS.clear()
+    _ANAGRAMS.clear()
+
+
+def anagram_cache(maxbytes=None, path=None):
+    '''
+    Sets the memory budget of the anagram cache in bytes, and opens
+    the sqlite file at `path` as its store so later runs start warm
+    (an empty string closes the store). Arguments left as None are
+    unchanged. The store can also be named with the TWL_ANAGRAMS
+    environment variable; it is opened on first use.
+
+    >>> twl.anagram_cache(maxbytes=64 << 20, path='anagrams.db')
+    '''
+    _ANAGRAMS.configure(maxbytes, path)
+
+
+def anagram_cache_info():
+    '''
+    Returns the anagram cache's memory hits, hits from its store,
+    misses, memory budget and bytes used, and entry count.
+    '''
+    return _ANAGRAMS.info()
 
 
 def iterator():
@@ -149,111 +302,955 @@ def iterator():
     >>> words = set(twl.iterator())
     >>> words = list(twl.iterator())
     '''
-    return iter(_DAWG)
+    return iter(_dawg())
 
 
 def children(prefix):
     '''
     Returns a list of letters that may appear after `prefix`.
     '''
-    return _DAWG.children(prefix)
+    return _dawg().children(prefix)
+
+
+def reachable(prefix):
+    '''
+    Returns a list of the letters that appear anywhere after `prefix`
+    in the words that start with it.
+
+    >>> twl.reachable('qu')[:5]
+    ['a', 'b', 'c', 'd', 'e']
+    '''
+    return _dawg().reachable(prefix.lower())
 
 
-def anagram(letters):
+def anagram(letters, min_length=0, max_length=None):
     '''
     Yields words that can be formed with some or all of the 
     given `letters`. `letters` may include '?' characters as
-    a wildcard.
+    a wildcard. Only words of `min_length` to `max_length` letters
+    are yielded, and branches that cannot reach that window are
+    skipped.
     '''
-    for word in _DAWG.anagram(letters.lower()):
+    for word in _dawg().anagram(letters.lower(), min_length, max_length):
         yield word
 
 
+def anagram_ids(letters):
+    '''
+    Returns an array of the ids of the words that anagram() yields,
+    in alphabetical order. `letters` may include '?' characters as a
+    wildcard.
+
+    Results are cached under the sorted letters, so every ordering of
+    the same tiles shares one entry, in an LRU cache with a memory
+    budget and an optional sqlite store (see anagram_cache()).
+
+    >>> [twl.word_list()[i] for i in twl.anagram_ids('pot')]
+    ['op', 'opt', 'pot', 'to', 'top']
+    '''
+    key = ''.join(sorted(letters.lower()))
+    ids = _ANAGRAMS.get(key)
+    if ids is None:
+        dawg = _dawg()
+        if numpy is not None and len(key) >= _LONG_ANAGRAM:
+            ids = array.array('I', formable(key).astype(numpy.uint32).tobytes())
+        else:
+            words = dawg.word_list()
+            ids = array.array('I', [bisect.bisect_left(words, word) for word in dawg.anagram(key)])
+        _ANAGRAMS.put(key, ids)
+    return ids
+
+
+def ranked_anagram(letters, scores, length_bonus=0):
+    '''
+    Yields (score, word) pairs for the words anagram() yields, best
+    score first and ties in alphabetical order. A word scores the sum
+    of `scores` (a dict from letter to points) over its letters, plus
+    `length_bonus` per letter. Letters missing from `scores` score 0,
+    and so do wildcards unless `scores` has a '?' entry. Hand letters
+    are used before wildcards.
+
+    With NumPy, the formable words are scored in one pass over the
+    letter count matrix and only sorted, so taking the first few is
+    cheap even for big hands.
+
+    >>> list(itertools.islice(twl.ranked_anagram('zebra', {'z': 10}, 1), 3))
+    [(15, 'braze'), (15, 'zebra'), (14, 'raze')]
+    '''
+    letters = letters.lower()
+    values = [0] * 26
+    for letter, score in scores.items():
+        if letter != WILD:
+            values[ord(letter.lower()) - 97] = score
+    wild_value = scores.get(WILD, 0)
+    if numpy is None:
+        bag = _bag(letters)
+        ranked = []
+        for word in _dawg().anagram(letters):
+            score = length_bonus * len(word)
+            for letter, count in collections.Counter(word).items():
+                real = min(count, bag[ord(letter)])
+                score += real * values[ord(letter) - 97] + (count - real) * wild_value
+            ranked.append((score, word))
+        ranked.sort(key=lambda pair: (-pair[0], pair[1]))
+        for pair in ranked:
+            yield pair
+        return
+    ids = numpy.frombuffer(anagram_ids(letters), numpy.uint32).astype(numpy.intp)
+    counts, lengths = letter_counts()
+    hand = numpy.zeros(26, dtype=numpy.int16)
+    for letter in letters:
+        if 'a' <= letter <= 'z':
+            hand[ord(letter) - 97] += 1
+    real = numpy.minimum(counts[ids], hand)
+    sizes = lengths[ids].astype(numpy.int64)
+    totals = real @ numpy.array(values) + (sizes - real.sum(axis=1)) * wild_value + sizes * length_bonus
+    word_list = _dawg().word_list()
+    for i in numpy.argsort(-totals, kind='stable'):
+        yield totals[i].item(), word_list[ids[i]]
+
+
+def fit(template, letters, overlap=None):
+    '''
+    Yields (start, word) pairs for every word that fits a line
+    template using some of the given `letters` for its open cells.
+
+    The template is a string with one character per cell: a letter
+    is a fixed tile, '.' an open cell and '#' a blocked cell. A word
+    fits at `start` if it covers no blocked cell, agrees with every
+    fixed tile it covers, fills at least one open cell, and the cells
+    just before and after it are not fixed tiles (it would otherwise
+    run into them). `letters` may include '?' characters as a
+    wildcard.
+
+    If `overlap` is a (first, last) pair of cell positions, only
+    words that cover at least one cell in that range are yielded,
+    and searches that cannot reach it are cut short.
+
+    >>> sorted(twl.fit('.o.', 'dg'))
+    [(0, 'do'), (0, 'dog'), (0, 'go'), (0, 'god'), (1, 'od')]
+    '''
+    cells = [_cell(cell) for cell in template]
+    first, last = overlap or (0, len(cells) - 1)
+    dawg = _dawg()
+    bag = _bag(letters.lower())
+    for start in range(min(last + 1, len(cells))):
+        if cells[start] == _BLOCKED or (start and cells[start - 1] > 0):
+            continue
+        if first - start > len(letters):  # not enough letters to reach the overlap range
+            continue
+        for word in dawg._fit(bag, cells, start, 0, [], False, first):
+            yield start, word
+
+
+def match(pattern, letters):
+    '''
+    Returns a NumPy array of the ids of the words, in alphabetical
+    order, that are as long as `pattern`, have its letters in the same
+    places, and fill its open cells ('.') from `letters`. `letters`
+    may include '?' characters as a wildcard. Requires NumPy.
+
+    Candidates come from ANDing the position index bitsets of the
+    pattern's letters (see _Dawg.position_index()), then a hand
+    check on the letter counts of the few that are left.
+
+    >>> [twl.word_list()[i] for i in twl.match('.e.r.', 'acdhst')]
+    ['dears', 'heard', 'hears', 'heart', 'tears']
+    '''
+    cells = [_cell(cell) for cell in pattern.lower()]
+    return _dawg().match(cells, _hand_counts(letters.lower()))
+
+
+def indexed_fit(template, letters, overlap=None):
+    '''
+    Yields the (start, word) pairs of fit(), found by a match() for
+    every placement window rather than by walking the DAWG, and so in
+    another order. Requires NumPy.
+    '''
+    cells = [_cell(cell) for cell in template.lower()]
+    first, last = overlap or (0, len(cells) - 1)
+    dawg = _dawg()
+    hand = _hand_counts(letters.lower())
+    tiles = len(letters)
+    word_list = dawg.word_list()
+    longest = int(dawg.letter_counts()[1].max())
+    for start in range(min(last + 1, len(cells))):
+        if cells[start] == _BLOCKED or (start and cells[start - 1] > 0):
+            continue
+        if first - start > tiles:  # cut short like fit()
+            continue
+        opened = 0
+        for end in range(start + 1, min(len(cells), start + longest) + 1):  # the word covers cells start to end - 1
+            cell = cells[end - 1]
+            if cell == _BLOCKED:
+                break
+            opened += cell == _OPEN
+            if opened > tiles:
+                break
+            if (not opened or end - start < 2 or end - 1 < first
+                    or (end < len(cells) and cells[end] > 0)):
+                continue
+            for i in dawg.match(cells[start:end], hand):
+                yield start, word_list[i]
+
+
+def dead_letters(letters, *extras):
+    '''
+    Returns a sorted list of the distinct `letters` that appear in no
+    word that can be formed from `letters` plus any one of `extras`
+    (say, the letters of each line of a board), or from `letters`
+    alone if there are none. A hand whose letters are all dead can
+    play no word at all. `letters` may include '?' characters as a
+    wildcard; they are never reported.
+
+    The search only follows branches whose reachable letters (see
+    reachable()) still include a letter it has not placed yet, and
+    stops once every letter is placed.
+
+    >>> twl.dead_letters('qxe', 'ab', 'ut')
+    ['q']
+    '''
+    letters = letters.lower()
+    wanted = 0
+    for letter in letters:
+        if 'a' <= letter <= 'z':
+            wanted |= _BITS[ord(letter)]
+    dawg = _dawg()
+    for extra in extras or ('',):
+        if not wanted:
+            break
+        wanted &= ~dawg.live_letters(letters + extra.lower(), wanted)
+    return [_CHARS[code] for code in range(97, 123) if wanted & _BITS[code]]
+
+
+def anchor_fit(template, letters, cross_checks=None):
+    '''
+    Yields (start, word) pairs like fit(), but only for words that
+    cover at least one anchor: an open cell next to a fixed tile in
+    the template, or an open cell listed in `cross_checks`.
+
+    `cross_checks` maps open cell positions to bitmasks of the letters
+    allowed there (bit 0 for 'a' through bit 25 for 'z'), usually
+    because of tiles next to the line (see cross_check()). Words are
+    grown from each anchor with left parts taken from the hand and
+    then extended through the cells to the right (Appel and Jacobson's
+    method), so every placement is found once, from the leftmost
+    anchor it covers. Fixed cells and hand letters outside 'a' to 'z'
+    never match, so no word covers or uses them.
+
+    >>> list(twl.anchor_fit('d.é', 'o'))
+    []
+    '''
+    cells = [_cell(cell) for cell in template]
+    cross_checks = cross_checks or {}
+    masks = [cross_checks.get(position, _ALL_LETTERS) for position in range(len(cells))]
+    anchors = set(cross_checks)
+    for position, cell in enumerate(cells):
+        if cell == _OPEN and ((position and cells[position - 1] > 0) or
+                              (position + 1 < len(cells) and cells[position + 1] > 0)):
+            anchors.add(position)
+    dawg = _dawg()
+    bag = _bag(letters.lower())
+    for anchor in sorted(anchors):
+        if anchor and cells[anchor - 1] > 0:  # the left part is the run of tiles before the anchor
+            start = anchor - 1
+            while start and cells[start - 1] > 0:
+                start -= 1
+            index = 0
+            for cell in cells[start:anchor]:
+                index = dawg._follow(index, cell)
+                if index is None:
+                    break
+            else:
+                prefix = [_CHARS[cell] for cell in cells[start:anchor]]
+                for word in dawg._extend(bag, cells, masks, anchor, index, prefix, anchor):
+                    yield start, word
+        else:  # left parts come from the hand, over the open cells back to the previous anchor
+            limit = 0
+            while (anchor - limit - 1 >= 0 and cells[anchor - limit - 1] == _OPEN
+                   and anchor - limit - 1 not in anchors):
+                limit += 1
+            for start, word in dawg._left_part(bag, cells, masks, anchor, 0, [], limit):
+                yield start, word
+
+
+def cross_check(before, after):
+    '''
+    Returns a bitmask of the letters that make a word when put between
+    `before` and `after` (bit 0 for 'a' through bit 25 for 'z'), the
+    form anchor_fit() takes for its cross checks. Gaps of 2 and 3
+    letter words are answered from a table built on first use, longer
+    ones are looked up in the DAWG and kept in a bounded cache.
+
+    >>> bin(twl.cross_check('d', 'g'))
+    '0b100000100000100000001'
+    '''
+    before = before.lower()
+    after = after.lower()
+    dawg = _dawg()
+    if len(before) + len(after) <= 2:
+        return dawg.cross_check_table().get((before, after), 0)
+    key = (before, after)
+    mask = _CROSS_CHECKS.get(key)
+    if mask is None:
+        mask = dawg.cross_check(before, after)
+        _CROSS_CHECKS.put(key, mask)
+    return mask
+
+
+def signature(letters):
+    '''
+    Returns the sorted-letter signature of `letters`. All anagrams
+    of a word share its signature.
+
+    >>> twl.signature('stop')
+    'opst'
+    '''
+    return ''.join(sorted(letters.lower()))
+
+
+def exact_anagram(letters):
+    '''
+    Returns a list of words that use exactly the given `letters`,
+    in alphabetical order. Uses a signature index that is built on
+    the first call. `letters` may include '?' characters as a
+    wildcard, which falls back to a search of the DAWG.
+
+    >>> twl.exact_anagram('pots')
+    ['opts', 'post', 'pots', 'spot', 'stop', 'tops']
+    '''
+    letters = letters.lower()
+    if WILD in letters:
+        return [word for word in _dawg().anagram(letters) if len(word) == len(letters)]
+    return list(_dawg().signatures().get(signature(letters), ()))
+
+
+def subset_anagram(letters):
+    '''
+    Yields words that can be formed with some or all of the given
+    `letters`, like anagram(), but by enumerating the signatures of
+    the sub-multisets of `letters` in the signature index. Words come
+    grouped by signature rather than in alphabetical order. `letters`
+    may include '?' characters as a wildcard, which falls back to a
+    search of the DAWG like exact_anagram().
+    '''
+    letters = letters.lower()
+    dawg = _dawg()
+    if WILD in letters:
+        for word in dawg.anagram(letters):
+            yield word
+        return
+    index = dawg.signatures()
+    prefixes = dawg.signature_prefixes()
+    groups = sorted(collections.Counter(letters).items())
+    for key in _sub_signatures(groups, 0, '', prefixes):
+        for word in index.get(key, ()):
+            yield word
+
+
+def _sub_signatures(groups, start, prefix, prefixes):
+    '''
+    Yields every signature that can be built by appending letters
+    from `groups[start:]` to `prefix`, skipping any branch whose
+    prefix does not begin a signature in the index.
+    '''
+    yield prefix
+    for i in range(start, len(groups)):
+        letter, count = groups[i]
+        key = prefix
+        for _ in range(count):
+            key += letter
+            if key not in prefixes:
+                break
+            for result in _sub_signatures(groups, i + 1, key, prefixes):
+                yield result
+
+
+def word_list():
+    '''
+    Returns a tuple of all words in alphabetical order. A word's
+    position in this tuple is its word id.
+    '''
+    return _dawg().word_list()
+
+
+def word_array():
+    '''
+    Returns a NumPy array of all words as fixed-width byte strings
+    (dtype 'S15' for TWL06), indexed by word id. Built on first use
+    from one pass over the DAWG; requires NumPy.
+
+    >>> twl.word_array()[:3]
+    array([b'aa', b'aah', b'aahed'], dtype='|S15')
+    '''
+    return _dawg().word_array()
+
+
+def letter_counts():
+    '''
+    Returns a (words x 26) uint8 NumPy matrix of the letter counts
+    of every word and a uint8 array of word lengths, both indexed by
+    word id. Built on first use; requires NumPy.
+    '''
+    return _dawg().letter_counts()[:2]
+
+
+def word_info():
+    '''
+    Returns the metadata of all words as a WordInfo of read-only
+    arrays indexed by word id: lengths, Scrabble scores, 26-bit
+    letter masks (bit 0 for 'a'), vowel counts and rare letter flags
+    (bit i set when the word has RARE[i]). Built with the dictionary
+    and stored in its cache file, so this costs nothing after the
+    first load; NumPy can wrap any of them with numpy.frombuffer().
+
+    >>> info = twl.word_info()
+    >>> info.scores[twl.word_id('quiz')], info.rare[twl.word_id('quiz')]
+    (22, 20)
+    '''
+    tables = _dawg().word_tables()
+    return WordInfo(*(memoryview(tables['word_' + name]) for name in ('lengths', 'scores', 'masks', 'vowels', 'rare')))
+
+
+def word_id(word):
+    '''
+    Returns the id of a word, its position in word_list(), or None if
+    it is not in the dictionary.
+
+    >>> twl.word_list()[twl.word_id('dog')]
+    'dog'
+    '''
+    words = _dawg().word_list()
+    i = bisect.bisect_left(words, word)
+    return i if i < len(words) and words[i] == word else None
+
+
+def formable(letters):
+    '''
+    Returns a NumPy array of the ids of all words that can be formed
+    with some or all of the given `letters`, in alphabetical order.
+    `letters` may include '?' characters as a wildcard.
+
+    Gives the same words as anagram() from one vectorized comparison
+    against the letter count matrix, which pays off for long queries.
+
+    >>> [twl.word_list()[i] for i in twl.formable('top')]
+    ['op', 'opt', 'pot', 'to', 'top']
+    '''
+    counts, lengths, masks = _dawg().letter_counts()
+    hand, wild = _hand_counts(letters.lower())
+    if wild:
+        ids = numpy.flatnonzero(lengths <= len(letters))
+        excess = (counts[ids] - hand).clip(0).sum(axis=1)
+        return ids[excess <= wild]
+    mask = _letter_mask(hand.nonzero()[0])
+    ids = numpy.flatnonzero((masks & (~mask & _ALL_LETTERS)) == 0)
+    return ids[(counts[ids] <= hand).all(axis=1)]
+
+
+def _hand_counts(letters):
+    '''
+    Returns the letter counts of a hand as a NumPy array of 26 ints
+    and the number of wildcards in it.
+    '''
+    hand = numpy.zeros(26, dtype=numpy.int16)
+    wild = 0
+    for letter in letters:
+        if letter == WILD:
+            wild += 1
+        elif 'a' <= letter <= 'z':
+            hand[ord(letter) - 97] += 1
+    return hand, wild
+
+
+def _bag_mask(bag):
+    '''
+    Returns the node mask (see _node_masks) of the letters a bag can
+    supply: every letter if it holds a wildcard.
+    '''
+    if bag[_WILD]:
+        return _ALL_BITS
+    mask = 0
+    for code in range(97, 123):
+        if bag[code]:
+            mask |= _BITS[code]
+    return mask
+
+
+def _bag(letters):
+    '''
+    Returns a list counting each letter code in `letters`.
+    '''
+    bag = [0] * 128
+    for letter in letters:
+        code = ord(letter)
+        if code < 128:
+            bag[code] += 1
+    return bag
+
+
+def _cell(cell):
+    '''
+    Returns the code of a fit() template cell: the letter code for
+    a fixed tile, _OPEN or _BLOCKED.
+    '''
+    if cell == OPEN:
+        return _OPEN
+    if cell == BLOCKED:
+        return _BLOCKED
+    return ord(cell.lower())
+
+
+def _letter_mask(offsets):
+    '''
+    Returns a bitmask with bit i set for each letter offset i
+    (0 for 'a' through 25 for 'z').
+    '''
+    mask = 0
+    for offset in offsets:
+        mask |= 1 << int(offset)
+    return mask
+
+
+def load(path):
+    '''
+    Replaces the TWL06 dictionary with a lexicon compiled by
+    words.lexicon, mapped from the file at `path`, and empties the
+    lookup caches. Every function of this module then answers from
+    the new lexicon.
+
+    >>> twl.load('house.dawg')
+    '''
+    global _DAWG
+    dawg = _read_cache(path)
+    if dawg is None:
+        raise ValueError('not a compiled lexicon: %s' % path)
+    if sys.byteorder != 'little':  # the file holds little-endian tables
+        tables = {}
+        for name, code in _TABLES + _WORD_TABLES:
+            tables[name] = array.array(code, getattr(dawg, name))
+            tables[name].byteswap()
+        dawg = _Dawg(**tables)
+    dawg.set_profile(_PROFILE)
+    with _LOCK:
+        _DAWG = dawg
+        cache_clear()
+
+
+def share():
+    '''
+    Copies the dictionary tables, the word metadata, the word list
+    and (with NumPy) the letter count matrix into a new shared memory block and returns
+    its name. Worker processes pass the name to attach() to read them
+    in place, instead of each decoding the dictionary and building its
+    own indexes. The block is freed when this process exits.
+
+    >>> name = twl.share()
+    '''
+    from multiprocessing import shared_memory
+    dawg = _dawg()
+    text, offsets = dawg.export()
+    dawg.annotations()
+    tables = {name: getattr(dawg, name) for name, _ in _TABLES}
+    tables.update(dawg.word_tables())
+    parts = [_pack_tables(tables, 0),
+             _SHARED_HEADER.pack(len(offsets) - 1, numpy is not None), bytes(offsets)]
+    if numpy is not None:
+        parts.append(dawg.letter_counts()[0].tobytes())
+    parts.append(bytes(text))
+    data = b''.join(parts)
+    block = shared_memory.SharedMemory(create=True, size=len(data))
+    block.buf[:len(data)] = data
+    _SHARED.append(block)
+    return block.name
+
+
+def attach(name):
+    '''
+    Switches this process to the dictionary another process shared
+    under `name` with share(), and empties the lookup caches. The
+    tables, the word list and the letter count matrix are all read in
+    place from the shared block, so each worker only pays for what
+    it builds itself (such as the signature index).
+
+    >>> twl.attach(name)  # in a worker
+    '''
+    global _DAWG
+    block = _open_shared(name)
+    view = block.buf
+    tables, offset = _read_tables(view)
+    if tables is None:
+        raise ValueError('not a shared dictionary: %s' % name)
+    dawg = _Dawg(buffer=block, **tables)
+    count, counted = _SHARED_HEADER.unpack_from(view, offset)
+    offset += _SHARED_HEADER.size
+    offsets = view[offset:offset + 4 * (count + 1)].cast('I')
+    offset += 4 * (count + 1)
+    if counted:
+        if numpy is not None:
+            counts = numpy.frombuffer(view, numpy.uint8, count * 26, offset).reshape(count, 26)
+            dawg._letter_counts = (counts, numpy.frombuffer(dawg.word_lengths, numpy.uint8),
+                                   numpy.frombuffer(dawg.word_masks, numpy.uint32))
+        offset += 26 * count
+    dawg._export = (view[offset:offset + offsets[-1]], offsets)
+    dawg._words = _WordList(*dawg._export)
+    dawg.set_profile(_PROFILE)
+    with _LOCK:
+        _DAWG = dawg
+        cache_clear()
+
+
+def profile(name=None):
+    '''
+    Returns the dictionary's performance profile, after switching to
+    `name` if one is given. Every profile gives the same answers:
+
+    - 'compact' (the default) keeps only the DAWG tables and builds
+      each index the first time a query needs it.
+    - 'fast' builds every index as soon as the dictionary loads,
+      including a set of all words that check() and check_many() use
+      instead of walking the DAWG, at the cost of tens of MB.
+
+    The profile can also be set with the TWL_PROFILE environment
+    variable. Switching back to compact drops the word set and the
+    signature index.
+
+    >>> twl.profile('fast')
+    'fast'
+    '''
+    global _PROFILE
+    if name is not None:
+        if name not in PROFILES:
+            raise ValueError('unknown profile %r, expected one of %s' % (name, ', '.join(PROFILES)))
+        with _LOCK:
+            _PROFILE = name
+            dawg = _DAWG
+        if dawg is not None:
+            dawg.set_profile(name)
+    return _PROFILE
+
+
+def preload():
+    '''
+    Loads the dictionary now rather than on the first lookup.
+
+    Useful for worker processes that should pay the loading cost
+    before any timing starts. Safe to call more than once.
+    '''
+    _dawg()
+
+
 END = '$'
 WILD = '?'
+OPEN = '.'
+BLOCKED = '#'
+
+_END = ord(END)
+_WILD = ord(WILD)
+_OPEN = 0
+_BLOCKED = -1
+_LONG_ANAGRAM = 12  # letters at which anagram_ids() uses formable() rather than walking the DAWG
+_CHARS = [chr(code) for code in range(128)]
+_MORE_TABLE = bytes(128) + bytes([1]) * 128
+_LETTER_TABLE = bytes(range(128)) * 2
+_ALL_LETTERS = (1 << 26) - 1
+
+# node mask bits (see _node_masks): END is bit 0, 'a' to 'z' bits 1 to 26
+_BITS = [0] * 128
+_BITS[_END] = 1
+for _code in range(97, 123):
+    _BITS[_code] = 1 << (_code - 96)
+_END_BIT = _BITS[_END]
+_ALL_BITS = ((1 << 27) - 1) ^ _END_BIT
+_CODES = [None, _END] + list(range(97, 123))  # letter code of each node mask bit, by bit length
+_popcount = getattr(int, 'bit_count', lambda mask: bin(mask).count('1'))
+
+# binary cache header: magic, format version, checksum of the module
+# data it was built from, record count, word count and checksum of the body
+_HEADER = struct.Struct('<8sIIIII')
+_MAGIC = b'TWLDAWG\0'
+_VERSION = 4
+
+# after the tables in a shared block: word count and whether the letter count matrix follows
+_SHARED_HEADER = struct.Struct('<II')
+
+# tables stored in the binary cache, in file order, with their array type codes
+_TABLES = (('links', 'I'), ('masks', 'I'), ('below', 'I'), ('more', 'B'), ('letters', 'B'),
+           ('longest', 'B'), ('shortest', 'B'))
+
+# word metadata stored in the binary cache after the tables, one entry per word id
+_WORD_TABLES = (('word_masks', 'I'), ('word_lengths', 'B'), ('word_scores', 'B'), ('word_vowels', 'B'),
+                ('word_rare', 'B'))
+
+# Scrabble tile values of 'a' to 'z', vowels and rare letters, as byte translation tables
+_SCORE_TABLE = bytes(97) + bytes([1, 3, 3, 2, 1, 4, 2, 4, 1, 8, 5, 1, 3, 1, 1, 3, 10, 1, 1, 1, 1, 4, 4, 8, 4,
+                                   10]) + bytes(133)
+_VOWEL_TABLE = bytes(chr(code) in 'aeiou' for code in range(256))
+RARE = 'jkqxz'  # letters with a word_info().rare flag, bit i for RARE[i]
+
+_DAWG = None  # loaded on first use, see _dawg()
+PROFILES = ('compact', 'fast')
+_PROFILE = os.environ.get('TWL_PROFILE') or 'compact'  # see profile()
+if _PROFILE not in PROFILES:
+    raise ValueError('unknown TWL_PROFILE %r, expected one of %s' % (_PROFILE, ', '.join(PROFILES)))
+_LOCK = threading.Lock()
+
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses maxsize currsize')
+AnagramCacheInfo = collections.namedtuple('AnagramCacheInfo', 'hits stored misses maxbytes currbytes entries')
+WordInfo = collections.namedtuple('WordInfo', 'lengths scores masks vowels rare')
 
 
 class _Dawg(object):
-    def __init__(self, data):
-        data = base64.b64decode(data)
-        data = zlib.decompress(data)
-        self.data = data
+    def __init__(self, more, letters, links, masks, longest=None, shortest=None, below=None, word_masks=None,
+                 word_lengths=None, word_scores=None, word_vowels=None, word_rare=None, buffer=None):
+        self.more = more
+        self.letters = letters
+        self.links = links
+        self.masks = masks  # children of each node from this record on, see _node_masks()
+        self.longest = longest  # annotations of each node from this record on, see annotations()
+        self.shortest = shortest
+        self.below = below
+        self.word_masks = word_masks  # metadata of each word id, see word_tables()
+        self.word_lengths = word_lengths
+        self.word_scores = word_scores
+        self.word_vowels = word_vowels
+        self.word_rare = word_rare
+        self.buffer = buffer  # keeps a mapped cache file open
+        self.word_set = None  # all words, in the fast profile
+        self._export = None
+        self._words = None
+        self._word_array = None
+        self._position_index = None
+        self._checksum = None
+        self._signatures = None
+        self._signature_prefixes = None
+        self._letter_counts = None
+        self._cross_check_table = None
 
     def _get_record(self, index):
-        a = index * 4
-        b = index * 4 + 4
-        x = struct.unpack('<I', self.data[a:b])[0]
-        more = bool(x & 0x80000000)
-        letter = chr((x >> 24) & 0x7f)
-        link = int(x & 0xffffff)
+        more = bool(self.more[index])
+        letter = chr(self.letters[index])
+        link = self.links[index]
         return (more, letter, link)
 
     def _get_child(self, index, letter):
-        while True:
-            more, other, link = self._get_record(index)
-            if other == letter:
-                return link
-            if not more:
-                return None
-            index += 1
+        return self._follow(index, ord(letter))
+
+    def _follow(self, index, code):
+        if code > 127:
+            return None
+        mask = self.masks[index]
+        bit = _BITS[code]
+        if not mask & bit:
+            return None
+        return self.links[index + _popcount(mask & (bit - 1))]
 
     def _get_children(self, index):
-        result = []
-        while True:
-            more, letter, link = self._get_record(index)
-            result.append(letter)
-            if not more:
-                break
+        more, letters = self.more, self.letters
+        result = [chr(letters[index])]
+        while more[index]:
             index += 1
+            result.append(chr(letters[index]))
         return result
 
-    def _anagram(self, bag, index=0, letters=None):
-        letters = letters or []
-        while True:
-            more, letter, link = self._get_record(index)
-            if letter == END:
-                yield ''.join(letters)
-            elif bag[letter]:
-                bag[letter] -= 1
-                letters.append(letter)
-                for word in self._anagram(bag, link, letters):
-                    yield word
-                letters.pop(-1)
-                bag[letter] += 1
-            elif bag[WILD]:
-                bag[WILD] -= 1
-                letters.append(letter)
-                for word in self._anagram(bag, link, letters):
+    def _anagram(self, bag, index, letters, have, low, high):
+        masks = self.masks
+        mask = masks[index]
+        depth = len(letters) + 1  # length of the words through a child
+        if mask & _END_BIT and depth > low:
+            yield ''.join(letters)
+        links, longest, shortest = self.links, self.longest, self.shortest
+        usable = mask & have  # only the children the hand can spell
+        while usable:
+            bit = usable & -usable
+            usable ^= bit
+            link = links[index + _popcount(mask & (bit - 1))]
+            if depth + shortest[link] > high or depth + longest[link] < low:
+                continue  # every word below is too long for the tiles left, or too short
+            code = _CODES[bit.bit_length()]
+            if bag[code]:
+                spent = code
+                bag[code] -= 1
+                rest = have if bag[code] or bag[_WILD] else have ^ bit
+            else:
+                spent = _WILD
+                bag[_WILD] -= 1
+                rest = have if bag[_WILD] else _bag_mask(bag)
+            if masks[link] & (rest | _END_BIT):  # else no letter left in the hand continues the word
+                letters.append(_CHARS[code])
+                for word in self._anagram(bag, link, letters, rest, low, high):
                     yield word
                 letters.pop(-1)
-                bag[WILD] += 1
-            if not more:
-                break
-            index += 1
+            bag[spent] += 1
+
+    def live_letters(self, letters, wanted):
+        '''
+        Returns the node mask bits of the letters in `wanted` (a node
+        mask) that appear in some word formable from `letters`.
+        '''
+        self.annotations()
+        bag = _bag(letters)
+        tiles = sum(bag[code] for code in range(97, 123)) + bag[_WILD]
+        return self._live(bag, 0, 0, _bag_mask(bag), wanted, tiles)
+
+    def _live(self, bag, index, seen, have, wanted, tiles):
+        masks, links, below, shortest = self.masks, self.links, self.below, self.shortest
+        mask = masks[index]
+        found = seen & wanted if mask & _END_BIT else 0  # `seen` holds the letters of the path so far
+        wanted &= ~found
+        usable = mask & have
+        while usable and wanted:
+            bit = usable & -usable
+            usable ^= bit
+            link = links[index + _popcount(mask & (bit - 1))]
+            if not (seen | bit | below[link]) & wanted or shortest[link] >= tiles:
+                continue  # nothing still wanted is on a word below, or no word below fits the tiles left
+            code = _CODES[bit.bit_length()]
+            if bag[code]:
+                spent = code
+                bag[code] -= 1
+                rest = have if bag[code] or bag[_WILD] else have ^ bit
+            else:
+                spent = _WILD
+                bag[_WILD] -= 1
+                rest = have if bag[_WILD] else _bag_mask(bag)
+            if masks[link] & (rest | _END_BIT):
+                got = self._live(bag, link, seen | bit, rest, wanted, tiles - 1)
+                found |= got
+                wanted &= ~got
+            bag[spent] += 1
+        return found
 
     def __contains__(self, word):
+        masks, links = self.masks, self.links
         index = 0
-        for letter in itertools.chain(word, END):
-            index = self._get_child(index, letter)
-            if index is None:
+        for letter in word:
+            code = ord(letter)
+            if code > 127:
                 return False
-        return True
+            mask = masks[index]
+            bit = _BITS[code]
+            if not mask & bit:
+                return False
+            index = links[index + _popcount(mask & (bit - 1))]
+        return bool(masks[index] & _END_BIT)
 
-    def __iter__(self, index=0, letters=None):
-        letters = letters or []
+    def _left_part(self, bag, cells, masks, anchor, index, letters, limit):
+        start = anchor - len(letters)
+        for word in self._extend(bag, cells, masks, anchor, index, letters, anchor):
+            yield start, word
+        if not limit:
+            return
+        more, codes, links = self.more, self.letters, self.links
         while True:
-            more, letter, link = self._get_record(index)
-            if letter == END:
-                yield ''.join(letters)
-            else:
-                letters.append(letter)
-                for word in self.__iter__(link, letters):
-                    yield word
+            code = codes[index]
+            if code != _END and (bag[code] or bag[_WILD]):
+                spent = code if bag[code] else _WILD
+                bag[spent] -= 1
+                letters.append(_CHARS[code])
+                for result in self._left_part(bag, cells, masks, anchor, links[index], letters, limit - 1):
+                    yield result
                 letters.pop(-1)
-            if not more:
+                bag[spent] += 1
+            if not more[index]:
                 break
             index += 1
 
+    def _extend(self, bag, cells, masks, position, index, letters, anchor):
+        cell = cells[position] if position < len(cells) else _BLOCKED
+        if cell > 0:  # fixed tile, the word has to go through it
+            index = self._follow(index, cell)
+            if index is not None:
+                letters.append(_CHARS[cell])
+                for word in self._extend(bag, cells, masks, position + 1, index, letters, anchor):
+                    yield word
+                letters.pop(-1)
+            return
+        links = self.links
+        node = self.masks[index]
+        if node & _END_BIT and position > anchor:
+            yield ''.join(letters)
+        if cell != _OPEN:
+            return
+        usable = node & masks[position] << 1  # letters both the node and the cross words allow
+        while usable:
+            bit = usable & -usable
+            usable ^= bit
+            code = _CODES[bit.bit_length()]
+            if bag[code] or bag[_WILD]:
+                spent = code if bag[code] else _WILD
+                bag[spent] -= 1
+                letters.append(_CHARS[code])
+                link = links[index + _popcount(node & (bit - 1))]
+                for word in self._extend(bag, cells, masks, position + 1, link, letters, anchor):
+                    yield word
+                letters.pop(-1)
+                bag[spent] += 1
+
+    def check_sorted(self, words):
+        '''
+        Yields (word, found) for each word of a sorted list, reusing
+        the traversal of the prefix shared with the previous word.
+        '''
+        path = [0]  # path[i] is the node reached after i letters of the previous word
+        previous = ''
+        for word in words:
+            common = 0
+            limit = min(len(previous), len(word), len(path) - 1)
+            while common < limit and previous[common] == word[common]:
+                common += 1
+            del path[common + 1:]
+            index = path[-1]
+            for letter in word[common:]:
+                index = self._follow(index, ord(letter))
+                if index is None:
+                    break
+                path.append(index)
+            yield word, index is not None and self._follow(index, _END) is not None
+            previous = word
+
+    def __iter__(self):
+        text, offsets = self.export()
+        text = str(text, 'ascii')
+        for i in range(len(offsets) - 1):
+            yield text[offsets[i]:offsets[i + 1]]
+
+    def export(self):
+        '''
+        Returns all words in alphabetical order as one bytes object
+        of the words end to end, and an array of offsets where word i
+        spans offsets[i] to offsets[i + 1]. Built on first use by a
+        depth first walk with an explicit stack of the next record to
+        visit at each depth.
+        '''
+        if self._export is None:
+            more, codes, links, masks = self.more, self.letters, self.links, self.masks
+            text = bytearray()
+            offsets = array.array('I', [0])
+            prefix = bytearray()
+            stack = [0]
+            while stack:
+                index = stack[-1]
+                if index < 0:  # the node is done
+                    stack.pop()
+                    if stack:
+                        del prefix[-1]
+                    continue
+                stack[-1] = index + 1 if more[index] else -1
+                code = codes[index]
+                if code == _END:
+                    text += prefix
+                    offsets.append(len(text))
+                elif masks[links[index]] == _END_BIT:  # the child only ends the word
+                    text += prefix
+                    text.append(code)
+                    offsets.append(len(text))
+                else:
+                    prefix.append(code)
+                    stack.append(links[index])
+            self._export = (bytes(text), offsets)
+        return self._export
+
     def children(self, prefix):
         index = 0
         for letter in prefix:
@@ -262,15 +1259,811 @@ class _Dawg(object):
                 return []
         return self._get_children(index)
 
-    def anagram(self, letters):
-        bag = collections.defaultdict(int)
-        for letter in letters:
-            bag[letter] += 1
-        for word in self._anagram(bag):
+    def reachable(self, prefix):
+        index = 0
+        for letter in prefix:
+            index = self._get_child(index, letter)
+            if index in (0, None):
+                return []
+        below = self.annotations()['below'][index]
+        return [_CHARS[_CODES[bit]] for bit in range(2, 28) if below >> (bit - 1) & 1]
+
+    def anagram(self, letters, min_length=0, max_length=None):
+        bag = _bag(letters)
+        tiles = sum(bag[code] for code in range(97, 123)) + bag[_WILD]
+        high = tiles if max_length is None else min(tiles, max_length)
+        self.annotations()
+        for word in self._anagram(bag, 0, [], _bag_mask(bag), min_length, high):
             yield word
 
+    def _fit(self, bag, cells, position, index, letters, used, reach):
+        more, codes, links = self.more, self.letters, self.links
+        cell = cells[position] if position < len(cells) else _BLOCKED
+        if cell > 0:  # fixed tile, the word has to go through it
+            while codes[index] != cell:
+                if not more[index]:
+                    return
+                index += 1
+            letters.append(_CHARS[cell])
+            for word in self._fit(bag, cells, position + 1, links[index], letters, used, reach):
+                yield word
+            letters.pop(-1)
+            return
+        while True:
+            code = codes[index]
+            if code == _END:
+                if used and position > reach:
+                    yield ''.join(letters)
+            elif cell == _BLOCKED:
+                break
+            elif bag[code] or bag[_WILD]:
+                spent = code if bag[code] else _WILD
+                bag[spent] -= 1
+                letters.append(_CHARS[code])
+                for word in self._fit(bag, cells, position + 1, links[index], letters, True, reach):
+                    yield word
+                letters.pop(-1)
+                bag[spent] += 1
+            if not more[index]:
+                break
+            index += 1
+
+    def word_list(self):
+        '''
+        Returns a tuple of all words in alphabetical order, built on
+        first use.
+        '''
+        if self._words is None:
+            self._words = tuple(self)
+        return self._words
+
+    def word_array(self):
+        '''
+        Returns all words as a NumPy array of fixed-width byte strings
+        indexed by word id, scattered straight from export() in one
+        step. Built on first use.
+        '''
+        if self._word_array is None:
+            if numpy is None:
+                raise ImportError('twl word arrays require NumPy')
+            text, offsets = self.export()
+            starts = numpy.frombuffer(offsets, numpy.uint32).astype(numpy.intp)
+            lengths = numpy.diff(starts)
+            width = int(lengths.max())
+            codes = numpy.zeros((len(lengths), width), numpy.uint8)
+            rows = numpy.repeat(numpy.arange(len(lengths)), lengths)
+            columns = numpy.arange(starts[-1]) - numpy.repeat(starts[:-1], lengths)
+            codes[rows, columns] = numpy.frombuffer(text, numpy.uint8)
+            self._word_array = codes.view('S%d' % width).ravel()
+        return self._word_array
+
+    def letter_counts(self):
+        '''
+        Returns the letter count matrix, the word lengths and the
+        26-bit letter masks of all words as NumPy arrays indexed by
+        word id, building them on first use.
+        '''
+        if self._letter_counts is None:
+            if numpy is None:
+                raise ImportError('twl letter counts require NumPy')
+            words = self.word_array()
+            codes = words.view(numpy.uint8).reshape(len(words), words.itemsize)
+            rows, columns = numpy.nonzero(codes)
+            offsets = rows * 26 + (codes[rows, columns] - 97)
+            counts = numpy.bincount(offsets, minlength=len(words) * 26).reshape(len(words), 26)
+            counts = counts.astype(numpy.uint8)
+            tables = self.word_tables()
+            lengths = numpy.frombuffer(tables['word_lengths'], numpy.uint8)
+            masks = numpy.frombuffer(tables['word_masks'], numpy.uint32)
+            self._letter_counts = (counts, lengths, masks)
+        return self._letter_counts
+
+    def set_profile(self, name):
+        '''
+        Builds every index now for the 'fast' profile, or drops the
+        biggest ones that profile built for 'compact' (see profile()).
+        '''
+        if name == 'fast':
+            self.word_tables()
+            if numpy is not None:
+                self.letter_counts()
+            self.signatures()
+            self.signature_prefixes()
+            self.cross_check_table()
+            self.word_set = frozenset(self.word_list())
+        else:
+            self.word_set = None
+            self._signatures = None
+            self._signature_prefixes = None
+
+    def checksum(self):
+        '''
+        Returns a checksum of the words, which tells lexicons apart in
+        the anagram cache's store. Computed on first use.
+        '''
+        if self._checksum is None:
+            text, offsets = self.export()
+            self._checksum = zlib.crc32(offsets, zlib.crc32(text))
+        return self._checksum
+
+    def annotations(self):
+        '''
+        Returns the tables that prune anagram searches (longest,
+        shortest and below) keyed by name, as read from the cache file
+        or, for a dictionary built without them, built on first use
+        (see _annotate()).
+        '''
+        if self.below is None:
+            longest, shortest, below = _annotate(self.more, self.letters, self.links)
+            self.longest, self.shortest = longest, shortest
+            self.below = below  # last, as it marks the tables built
+        return {'longest': self.longest, 'shortest': self.shortest, 'below': self.below}
+
+    def word_tables(self):
+        '''
+        Returns the word metadata tables keyed by name, as read from the
+        cache file or, for a dictionary built without them, built from
+        export() on first use (see _word_tables()).
+        '''
+        if self.word_lengths is None:
+            for name, table in _word_tables(*self.export()).items():
+                setattr(self, name, table)
+        return {name: getattr(self, name) for name, _ in _WORD_TABLES}
+
+    def position_index(self):
+        '''
+        Returns a dict from word length to the ids of the words of
+        that length and a (length x 26 x bytes) uint8 array of bitsets
+        over them, packed 8 words to a byte: bit i of [position, letter]
+        is set when the i-th of those words has that letter there.
+        Built on first use.
+        '''
+        if self._position_index is None:
+            words = self.word_array()
+            codes = words.view(numpy.uint8).reshape(len(words), words.itemsize)
+            lengths = self.letter_counts()[1]
+            index = {}
+            for length in numpy.unique(lengths).tolist():
+                ids = numpy.flatnonzero(lengths == length)
+                bits = numpy.zeros((length, 26, len(ids)), dtype=bool)
+                columns = numpy.arange(len(ids))
+                for position in range(length):
+                    bits[position, codes[ids, position] - 97, columns] = True
+                index[length] = (ids, numpy.packbits(bits, axis=2))
+            self._position_index = index
+        return self._position_index
+
+    def match(self, cells, hand):
+        '''
+        Returns the ids of the words that fit `cells` (fixed letter
+        codes and _OPEN cells) exactly, filling the open cells from
+        `hand`, a (letter counts, wildcards) pair. Cells outside 'a'
+        to 'z' match nothing, as in fit().
+        '''
+        entry = self.position_index().get(len(cells))
+        if entry is None:
+            return numpy.zeros(0, dtype=numpy.intp)
+        ids, bitsets = entry
+        fixed = numpy.zeros(26, dtype=numpy.int16)
+        bits = None
+        for position, cell in enumerate(cells):
+            if cell > 0:
+                if not 97 <= cell <= 122:  # no word has a letter outside 'a' to 'z'
+                    return numpy.zeros(0, dtype=numpy.intp)
+                fixed[cell - 97] += 1
+                if bits is None:
+                    bits = bitsets[position, cell - 97].copy()
+                else:
+                    bits &= bitsets[position, cell - 97]
+        if bits is not None:
+            ids = ids[numpy.flatnonzero(numpy.unpackbits(bits, count=len(ids)))]
+        counts, wild = hand
+        excess = (self.letter_counts()[0][ids] - fixed - counts).clip(0).sum(axis=1)
+        return ids[excess <= wild]
+
+    def cross_check(self, before, after):
+        '''
+        Returns the bitmask of letters that fill the gap between
+        `before` and `after`, in the layout of cross_check().
+        '''
+        index = 0
+        for letter in before:
+            index = self._get_child(index, letter)
+            if index is None:
+                return 0
+        links = self.links
+        node = self.masks[index]
+        mask = 0
+        usable = node & _ALL_BITS
+        while usable:
+            bit = usable & -usable
+            usable ^= bit
+            child = links[index + _popcount(node & (bit - 1))]
+            for letter in after:
+                child = self._get_child(child, letter)
+                if child is None:
+                    break
+            else:
+                if self.masks[child] & _END_BIT:
+                    mask |= bit
+        return mask >> 1
+
+    def cross_check_table(self):
+        '''
+        Returns a dict from (before, after) pairs to cross_check()
+        masks for every gap in the 2 and 3 letter words, building it
+        on first use. Missing pairs allow no letter.
+        '''
+        if self._cross_check_table is None:
+            table = {}
+            more, codes, links = self.more, self.letters, self.links
+            stack = [(0, '')]
+            while stack:  # visit the words of up to 3 letters
+                index, prefix = stack.pop()
+                while True:
+                    code = codes[index]
+                    if code == _END:
+                        for gap in range(len(prefix)):
+                            key = (prefix[:gap], prefix[gap + 1:])
+                            table[key] = table.get(key, 0) | 1 << (ord(prefix[gap]) - 97)
+                    elif len(prefix) < 3:
+                        stack.append((links[index], prefix + _CHARS[code]))
+                    if not more[index]:
+                        break
+                    index += 1
+            self._cross_check_table = table
+        return self._cross_check_table
+
+    def signatures(self):
+        '''
+        Returns a dict from sorted-letter signatures to the words
+        with that signature, building it on first use.
+        '''
+        if self._signatures is None:
+            index = {}
+            if numpy is None:
+                keys = (''.join(sorted(word)) for word in self.word_list())
+            else:  # sort the letters of every word at once, keeping the padding at the end
+                words = self.word_array()
+                codes = words.view(numpy.uint8).reshape(len(words), words.itemsize)
+                codes = numpy.sort(numpy.where(codes, codes, 255), axis=1)
+                codes[codes == 255] = 0
+                keys = codes.view(words.dtype).ravel().astype('U%d' % words.itemsize).tolist()
+            for key, word in zip(keys, self.word_list()):
+                if key in index:
+                    index[key] += (word,)
+                else:
+                    index[key] = (word,)
+            self._signatures = index
+        return self._signatures
+
+    def signature_prefixes(self):
+        '''
+        Returns the set of non-empty prefixes of all signatures,
+        used to prune sub-multiset enumeration.
+        '''
+        if self._signature_prefixes is None:
+            prefixes = set()
+            for key in self.signatures():
+                for i in range(len(key), 0, -1):
+                    if key[:i] in prefixes:
+                        break
+                    prefixes.add(key[:i])
+            self._signature_prefixes = prefixes
+        return self._signature_prefixes
+
+
+def _unpack(data):
+    '''
+    Splits a packed table of 32-bit records into three parallel
+    arrays: more flags (bytes, 0 or 1), letter codes (bytes) and
+    links (array of unsigned 32-bit ints).
+
+    The high byte of each record holds both the More flag and the
+    letter, so both arrays come from one strided slice of the data.
+    '''
+    high = data[3::4]
+    more = high.translate(_MORE_TABLE)
+    letters = high.translate(_LETTER_TABLE)
+    masked = bytearray(data)
+    masked[3::4] = bytes(len(high))
+    links = array.array('I')
+    links.frombytes(masked)
+    if sys.byteorder == 'big':
+        links.byteswap()
+    return more, letters, links
+
+
+def _node_masks(more, letters):
+    '''
+    Returns an array with, for every record, a bitmask of its letter
+    and the letters of the sibling records after it: bit 0 for the
+    END sentinel and bits 1 to 26 for 'a' to 'z', so bits run in the
+    same order as the records. For the first record of a node this
+    is the set of the node's children, and a child's record is the
+    node's index plus the number of mask bits below the child's bit.
+    '''
+    masks = array.array('I', bytes(4 * len(letters)))
+    following = 0
+    for index in range(len(letters) - 1, -1, -1):
+        following = _BITS[letters[index]] | (following if more[index] else 0)
+        masks[index] = following
+    return masks
+
+
+def _annotate(more, letters, links):
+    '''
+    Returns three arrays that describe, for every record, the words
+    below it and its later siblings, so that at a node's first record
+    they describe the whole node: the most and the fewest letters a
+    word can still add (bytes), and the node mask (see _node_masks)
+    of all letters that can appear below it.
+
+    Nodes are finished children first, from an explicit stack.
+    '''
+    longest = bytearray(len(letters))
+    shortest = bytearray(len(letters))
+    below = array.array('I', bytes(4 * len(letters)))
+    state = bytearray(len(letters))  # 1 once a node's children are queued, 2 once it is done
+    stack = [0]
+    while stack:
+        start = stack[-1]
+        if state[start] == 2:
+            stack.pop()
+            continue
+        if not state[start]:
+            state[start] = 1
+            index = start
+            while True:
+                if letters[index] != _END and state[links[index]] != 2:
+                    stack.append(links[index])
+                if not more[index]:
+                    break
+                index += 1
+            continue
+        end = start
+        while more[end]:
+            end += 1
+        most, fewest, seen = 0, 255, 0
+        for index in range(end, start - 1, -1):
+            if letters[index] == _END:
+                fewest = 0
+            else:
+                link = links[index]
+                most = max(most, longest[link] + 1)
+                fewest = min(fewest, shortest[link] + 1)
+                seen |= _BITS[letters[index]] | below[link]
+            longest[index] = most
+            shortest[index] = fewest
+            below[index] = seen
+        state[start] = 2
+        stack.pop()
+    return longest, shortest, below
+
+
+def _build_tables(data, complete=True):
+    '''
+    Returns the tables of a _Dawg, keyed by name, built from a packed
+    table of 32-bit records. Without `complete` only the tables that
+    word lookups need are built, and the annotations and the word
+    metadata tables are left for the _Dawg to build if they are ever
+    asked for.
+    '''
+    more, letters, links = _unpack(data)
+    tables = {'more': more, 'letters': letters, 'links': links, 'masks': _node_masks(more, letters)}
+    if complete:
+        dawg = _Dawg(**tables)
+        tables.update(dawg.annotations())
+        tables.update(dawg.word_tables())
+    return tables
+
+
+def _word_tables(text, offsets):
+    '''
+    Returns the word metadata tables, keyed by name, of the words in
+    export() form: 26-bit letter masks (bit 0 for 'a'), then as bytes
+    the lengths, Scrabble scores, vowel counts and rare letter flags.
+    Scores and vowel counts are differences of running sums over the
+    whole text.
+    '''
+    spans = list(zip(offsets, offsets[1:]))
+    bits = [1 << (code - 97) if 97 <= code <= 122 else 0 for code in range(256)]
+    masks = array.array('I', [functools.reduce(operator.or_, map(bits.__getitem__, text[start:end]), 0)
+                              for start, end in spans])
+    scores = list(itertools.accumulate(text.translate(_SCORE_TABLE), initial=0))
+    vowels = list(itertools.accumulate(text.translate(_VOWEL_TABLE), initial=0))
+    rare_bits = [bits[ord(letter)] for letter in RARE]
+    flags = {}  # rare letter flags by the rare letters of a mask
+    for i in range(1 << len(RARE)):
+        flags[sum(bit for j, bit in enumerate(rare_bits) if i >> j & 1)] = i
+    rare_mask = sum(rare_bits)
+    return {'word_masks': masks,
+            'word_lengths': bytearray(end - start for start, end in spans),
+            'word_scores': bytearray(scores[end] - scores[start] for start, end in spans),
+            'word_vowels': bytearray(vowels[end] - vowels[start] for start, end in spans),
+            'word_rare': bytearray(flags[mask & rare_mask] for mask in masks)}
+
+
+def _cache_paths():
+    '''
+    Returns the paths the binary cache file may be at, in the order
+    they are tried: __pycache__ next to this module, then the user's
+    cache directory ($XDG_CACHE_HOME or ~/.cache), then the temporary
+    directory, so installs into read-only locations still get a
+    cache. Set TWL_CACHE to a file path to use only that path, or to
+    an empty string to turn caching off (an empty list).
+    '''
+    path = os.environ.get('TWL_CACHE')
+    if path is not None:
+        return [path] if path else []
+    here = os.path.dirname(os.path.abspath(__file__))
+    user = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    temp = 'twl-%d' % os.getuid() if hasattr(os, 'getuid') else 'twl'  # one per user, as others may own it
+    folders = [os.path.join(here, '__pycache__'), os.path.join(user, 'twl'),
+               os.path.join(tempfile.gettempdir(), temp)]
+    return [os.path.join(folder, 'twl06.dawg') for folder in folders]
+
+
+def _writable(path):
+    '''
+    Returns True if a cache file can be written at `path`, creating
+    its directory if need be.
+    '''
+    folder = os.path.dirname(path) or '.'
+    try:
+        os.makedirs(folder, exist_ok=True)
+    except OSError:
+        return False
+    return os.access(folder, os.W_OK) and not os.path.isdir(path)
+
+
+def _pack_tables(tables, source):
+    '''
+    Returns the tables of a _Dawg in the binary cache format: a fixed
+    header followed by each table in _TABLES order, then each word
+    table in _WORD_TABLES order. `source` is a checksum of the data
+    the tables were built from.
+    '''
+    body = b''.join(bytes(tables[name]) for name, _ in _TABLES + _WORD_TABLES)
+    header = _HEADER.pack(_MAGIC, _VERSION, source, len(tables['letters']), len(tables['word_lengths']),
+                          zlib.crc32(body))
+    return header + body
+
+
+def _write_cache(path, tables, source):
+    '''
+    Writes the tables of a _Dawg to `path` in the binary cache format.
+    The file is written to a temporary name and renamed so readers
+    never see it half done.
+    '''
+    data = _pack_tables(tables, source)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        with open(temp, 'wb') as f:
+            f.write(data)
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):  # the write or the rename failed
+            os.remove(temp)
+
+
+def _read_tables(view, source=None):
+    '''
+    Returns the tables in binary cache format at the start of `view`,
+    as memoryviews into it keyed by name, and the offset where they
+    end. Returns (None, 0) if the view is from another version or
+    does not match its checksum (or `source`, when given).
+    '''
+    if len(view) < _HEADER.size:
+        return None, 0
+    magic, version, built_from, count, words, checksum = _HEADER.unpack(view[:_HEADER.size])
+    sizes = [(name, code, array.array(code).itemsize * count) for name, code in _TABLES]
+    sizes += [(name, code, array.array(code).itemsize * words) for name, code in _WORD_TABLES]
+    end = _HEADER.size + sum(size for _, _, size in sizes)
+    body = view[_HEADER.size:end]
+    if (magic != _MAGIC or version != _VERSION or source not in (None, built_from)
+            or len(view) < end or zlib.crc32(body) != checksum):
+        return None, 0
+    tables = {}
+    offset = 0
+    for name, code, size in sizes:
+        tables[name] = body[offset:offset + size].cast(code)
+        offset += size
+    return tables, end
+
+
+def _read_cache(path, source=None):
+    '''
+    Maps the cache file at `path` and returns a _Dawg that reads its
+    tables straight from the mapping, or None if the file is missing
+    or not a valid cache (see _read_tables).
+    '''
+    try:
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    view = memoryview(buffer)
+    tables, end = _read_tables(view, source)
+    if tables is None or end != len(view):
+        tables = None  # drops the views into the mapping so it can be closed
+        view.release()
+        buffer.close()
+        return None
+    return _Dawg(buffer=buffer, **tables)
+
+
+def _open_shared(name):
+    '''
+    Opens the shared memory block `name` without taking ownership of
+    it: the process that created it frees it.
+    '''
+    from multiprocessing import resource_tracker, shared_memory
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:  # before Python 3.13 every open block is tracked, and unlinked with the tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+def _unshare():
+    '''
+    Frees the shared memory blocks made by share().
+    '''
+    while _SHARED:
+        block = _SHARED.pop()
+        block.close()
+        block.unlink()
+
+
+class _WordList(collections.abc.Sequence):
+    '''
+    A read-only sequence of words stored end to end in a buffer, where
+    word i spans offsets[i] to offsets[i + 1]. Stands in for the word
+    list tuple of a shared dictionary, see attach().
+    '''
+    def __init__(self, text, offsets):
+        self.text = text
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('word index out of range')
+        return bytes(self.text[self.offsets[index]:self.offsets[index + 1]]).decode()
+
+
+class _AnagramCache(object):
+    '''
+    A thread-safe LRU map from sorted letters to arrays of word ids,
+    bounded by the bytes its entries take, that counts its hits and
+    misses. With a path it is backed by an sqlite store, keyed also by
+    the lexicon's checksum, that misses are looked up in and results
+    are written to (committed in batches and at exit).
+    '''
+    def __init__(self, maxbytes, path=None):
+        self.maxbytes = maxbytes
+        self.path = path
+        self.bytes = 0
+        self.hits = 0
+        self.stored = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._pending = 0
+
+    def configure(self, maxbytes=None, path=None):
+        with self._lock:
+            if maxbytes is not None:
+                self.maxbytes = maxbytes
+                self._evict()
+            if path is not None:
+                self._close()
+                self.path = path or None
+
+    def get(self, key):
+        lexicon = _dawg().checksum() if self.path else None  # outside the lock, loading takes _LOCK
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return value
+            db = self._connect()
+            if db is not None and lexicon is not None:
+                row = db.execute('SELECT ids FROM anagrams WHERE lexicon = ? AND letters = ?',
+                                 (lexicon, key)).fetchone()
+                if row is not None:
+                    self.stored += 1
+                    value = array.array('I', row[0])
+                    self._add(key, value)
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        lexicon = _dawg().checksum() if self.path else None
+        with self._lock:
+            self._add(key, value)
+            db = self._connect()
+            if db is not None and lexicon is not None:
+                try:
+                    db.execute('INSERT OR REPLACE INTO anagrams VALUES (?, ?, ?)', (lexicon, key, value.tobytes()))
+                    self._pending += 1
+                    if self._pending >= 256:
+                        self._commit()
+                except sqlite3.Error:  # the store is best effort, e.g. another process holds the lock
+                    pass
+
+    def info(self):
+        with self._lock:
+            return AnagramCacheInfo(self.hits, self.stored, self.misses, self.maxbytes, self.bytes,
+                                    len(self._data))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.stored = 0
+            self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _add(self, key, value):
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.bytes -= _entry_size(key, old)
+        self._data[key] = value
+        self.bytes += _entry_size(key, value)
+        self._evict()
+
+    def _evict(self):
+        while self.bytes > self.maxbytes and self._data:
+            key, value = self._data.popitem(last=False)
+            self.bytes -= _entry_size(key, value)
+
+    def _connect(self):
+        if self._db is None and self.path:
+            self._db = sqlite3.connect(self.path, timeout=1, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS anagrams (lexicon INTEGER, letters TEXT, ids BLOB, '
+                             'PRIMARY KEY (lexicon, letters)) WITHOUT ROWID')
+        return self._db
+
+    def _commit(self):
+        try:
+            self._db.commit()
+        except sqlite3.Error:
+            self._db.rollback()
+        self._pending = 0
+
+    def _close(self):
+        if self._db is not None:
+            self._commit()
+            self._db.close()
+            self._db = None
+
+
+def _entry_size(key, value):
+    '''
+    Returns the bytes an anagram cache entry takes: its key string and
+    its array of ids.
+    '''
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class _LookupCache(object):
+    '''
+    A bounded, thread-safe LRU map from words to lookup results that
+    counts its hits and misses.
+    '''
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_CACHE = _LookupCache(1 << 16)
+_CROSS_CHECKS = _LookupCache(1 << 14)
+_ANAGRAMS = _AnagramCache(16 << 20, os.environ.get('TWL_ANAGRAMS'))
+atexit.register(_ANAGRAMS.close)
+_SHARED = []  # shared memory blocks made by share()
+atexit.register(_unshare)
+
+
+def _dawg():
+    '''
+    Returns the dictionary, loading it on first use. The lock makes
+    sure concurrent first calls load it only once.
+    '''
+    global _DAWG
+    dawg = _DAWG
+    if dawg is None:
+        with _LOCK:
+            if _DAWG is None:
+                dawg = _load()
+                dawg.set_profile(_PROFILE)
+                _DAWG = dawg
+            dawg = _DAWG
+    return dawg
+
+
+def _load():
+    '''
+    Returns the dictionary, mapped from the binary cache when one is
+    available. The first load decodes the compressed module data and
+    writes the cache so that later processes (and concurrent workers,
+    through the shared page cache) skip the decode step.
+    '''
+    paths = _cache_paths()
+    if not paths or sys.byteorder != 'little':
+        return _Dawg(**_build_tables(zlib.decompress(base64.b64decode(_DATA)), complete=False))
+    source = zlib.crc32(_DATA.encode())
+    for path in paths:
+        dawg = _read_cache(path, source)
+        if dawg is not None:
+            return dawg
+    data = zlib.decompress(base64.b64decode(_DATA))
+    tables = None
+    for path in paths:  # the first place the cache can be written to
+        if not _writable(path):
+            continue
+        if tables is None:
+            tables = _build_tables(data)
+        try:
+            _write_cache(path, tables, source)
+        except OSError:
+            continue
+        return _read_cache(path, source) or _Dawg(**tables)
+    if tables is None:  # nowhere to keep the tables, so only build the costly ones if they are asked for
+        tables = _build_tables(data, complete=False)
+    return _Dawg(**tables)
+
 
-_DAWG = _Dawg(
+_DATA = (
     "eJxknXd8lMXTwOfSLr33nmDvvStWsCB2UUDwkhxJII1LAgkqiB3svYvYBRvYBUUFG9gbYs"
     "OUIwmkkYRi5f3O7nM5+L1/3OfueXZ3+s7ObLtskZa3yqT1rv2l7aAHpf25a8W/3yeyoe91"
     "6fi+Rzq7f5au2W7XxpUu16bj93Z13xfj6ukb7epdcaSr76cJrv47L3VtPvBd18DZN7kGBz"